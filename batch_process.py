@@ -0,0 +1,237 @@
+"""
+Headless batch runner for the Roller shaft deflection report.
+
+Processes every survey workbook in a directory (or matching a glob) on a
+process pool and writes one Excel file and one PDF report per input.
+
+Usage:
+    python batch_process.py surveys/ --manifest manifest.json --output-dir reports
+    python batch_process.py "surveys/2024_*.xlsx" --manifest manifest.json --workers 8
+
+The manifest is a JSON file holding the same fields as the GUI form.
+Top-level values apply to every survey, entries under "files" override
+them for a single workbook (matched by file name):
+
+    {
+        "company_name": "Allan Smith Engineering",
+        "equipment_name": "Kiln 1",
+        "feed_rate": "3000 TPD",
+        "date_of_measurement": "12/03/2024",
+        "positions": 64,
+        "no_of_pier": "4",
+        "radar_positions": 21,
+        "files": {
+            "kiln2_survey.xlsx": {"equipment_name": "Kiln 2", "positions": 32}
+        }
+    }
+
+An optional "angles" list (degrees, one per position) gives encoder
+angles for non-uniform positions; it needs --fit-mode lstsq.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use("Agg")
+
+import module5
+from columnar_store import STORE_FORMATS
+from run_trace import TRACE_FILE
+from runout_kernels import limit_kernel_threads
+
+
+MANIFEST_FIELDS = [
+    'company_name', 'equipment_name', 'feed_rate', 'date_of_measurement',
+    'positions', 'no_of_pier', 'radar_positions',
+]
+
+
+def find_surveys(inputs):
+    """Expand directories and glob patterns into a sorted list of .xlsx files"""
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = glob.glob(os.path.join(item, "*.xlsx")) + glob.glob(os.path.join(item, "*.xls"))
+        else:
+            matches = glob.glob(item)
+        # Skip Excel lock files left behind by open workbooks
+        files.extend(f for f in matches if not os.path.basename(f).startswith("~$"))
+    return sorted(set(files))
+
+
+def load_manifest(manifest_path):
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if not isinstance(manifest, dict):
+        raise ValueError("Manifest must be a JSON object")
+    return manifest
+
+
+def survey_settings(manifest, file_path):
+    """Merge the manifest defaults with the per-file overrides for one survey"""
+    settings = {key: manifest.get(key) for key in MANIFEST_FIELDS}
+    overrides = manifest.get("files", {}).get(os.path.basename(file_path), {})
+    settings.update(overrides)
+
+    missing = [key for key in MANIFEST_FIELDS if settings.get(key) in (None, "")]
+    if missing:
+        raise ValueError(f"Missing manifest fields for {os.path.basename(file_path)}: {', '.join(missing)}")
+
+    # Optional encoder angles per position (degrees), for the least-squares fit
+    settings['angles'] = overrides.get('angles', manifest.get('angles'))
+
+    settings['positions'] = int(settings['positions'])
+    settings['radar_positions'] = int(settings['radar_positions'])
+    if settings['radar_positions'] < 3:
+        raise ValueError("Radar chart positions must be at least 3.")
+    return settings
+
+
+def process_survey(file_path, settings, output_dir, options):
+    """
+    Worker entry point: process one survey and return its output paths.
+    options: extra process_file keyword arguments shared by the whole batch;
+             "columnar_format" turns into a <name>_store directory per survey.
+    """
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    output_file = os.path.join(output_dir, f"{stem}_processed.xlsx")
+    pdf_path = os.path.join(output_dir, f"{stem}_report.pdf")
+
+    options = dict(options)
+    if options.get('columnar_format'):
+        options['columnar_store'] = os.path.join(output_dir, f"{stem}_store")
+    else:
+        options.pop('columnar_format', None)
+
+    start = time.perf_counter()
+    module5.process_file(
+        file_path,
+        settings['company_name'],
+        settings['equipment_name'],
+        settings['feed_rate'],
+        settings['date_of_measurement'],
+        settings['positions'],
+        settings['no_of_pier'],
+        settings['radar_positions'],
+        output_file=output_file,
+        pdf_path=pdf_path,
+        interactive=False,
+        angles=settings['angles'],
+        **options,
+    )
+    return output_file, pdf_path, time.perf_counter() - start
+
+
+def run_batch(files, manifest, output_dir, workers=None, **options):
+    """
+    Fan the surveys out across a process pool, returns (succeeded, failed) lists.
+    options are passed on to process_file for every survey.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    write_excel = options.get('write_excel', True)
+
+    succeeded = []
+    failed = []
+
+    jobs = []
+    for file_path in files:
+        try:
+            jobs.append((file_path, survey_settings(manifest, file_path)))
+        except ValueError as e:
+            print(f"[Error] {e}")
+            failed.append((file_path, str(e)))
+
+    # Each worker gets its share of the cores for the numba kernel instead of one thread per core
+    pool_size = min(workers, max(len(jobs), 1))
+    kernel_threads = max((os.cpu_count() or 1) // pool_size, 1)
+    with ProcessPoolExecutor(max_workers=pool_size, initializer=limit_kernel_threads,
+                             initargs=(kernel_threads,)) as executor:
+        futures = {
+            executor.submit(process_survey, file_path, settings, output_dir, options): file_path
+            for file_path, settings in jobs
+        }
+        for future in as_completed(futures):
+            file_path = futures[future]
+            try:
+                output_file, pdf_path, elapsed = future.result()
+                output_file = output_file if write_excel else None
+                print(f"[Success] {os.path.basename(file_path)} -> {pdf_path} ({elapsed:.1f}s)")
+                succeeded.append((file_path, output_file, pdf_path))
+            except Exception as e:
+                print(f"[Error] {os.path.basename(file_path)}: {e}")
+                failed.append((file_path, str(e)))
+
+    return succeeded, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch process Roller shaft deflection survey workbooks.")
+    parser.add_argument("inputs", nargs="+", help="Survey directories, .xlsx files or glob patterns")
+    parser.add_argument("--manifest", required=True, help="JSON file with company, equipment and survey settings")
+    parser.add_argument("--output-dir", default="reports", help="Directory for the Excel and PDF outputs")
+    parser.add_argument("--no-excel", action="store_true", help="Only write the PDF reports, skip the processed workbooks")
+    parser.add_argument("--excel-mode", choices=module5.EXCEL_MODES, default="standard",
+                        help="streaming: write-only workbook written pier by pier (low memory for large surveys)")
+    parser.add_argument("--columnar", choices=sorted(STORE_FORMATS), default=None,
+                        help="Also write a columnar result store (<name>_store/) in Arrow IPC or Parquet")
+    parser.add_argument("--chart-mode", choices=module5.CHART_MODES, default="raster",
+                        help="raster: matplotlib images, vector: charts drawn natively in the PDF (smaller files)")
+    parser.add_argument("--cache-dir", default=module5.SURVEY_CACHE_DIR,
+                        help="Directory for parsed-survey cache files keyed by content hash (default: per-user cache)")
+    parser.add_argument("--pier-cache-dir", default=module5.PIER_CACHE_DIR,
+                        help="Directory for per-pier results, reused when a pier's column is unchanged (default: per-user cache)")
+    parser.add_argument("--harmonics", type=int, default=module5.DEFAULT_HARMONICS,
+                        help="Run-out harmonics (FFT amplitude and phase) per pier in the Summary and report, 0 to disable")
+    parser.add_argument("--fit-mode", choices=module5.FIT_MODES, default="sum",
+                        help="lstsq: least-squares eccentricity over the valid readings only (robust to missing readings)")
+    parser.add_argument("--backend", choices=module5.BACKENDS, default="auto",
+                        help="Runout engine: numba (compiled kernel, needs numba installed), numpy, or auto")
+    parser.add_argument("--report-workers", type=int, default=None,
+                        help="Processes rendering each report's charts (for a few large surveys; adds to --workers)")
+    parser.add_argument("--report-executor", choices=module5.CHART_EXECUTORS, default="process",
+                        help="thread: render the report charts in threads of each worker instead of extra processes")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the survey and per-pier caches")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: number of CPU cores)")
+    args = parser.parse_args(argv)
+
+    files = find_surveys(args.inputs)
+    if not files:
+        print("[Error] No survey workbooks found.")
+        return 1
+
+    manifest = load_manifest(args.manifest)
+
+    start = time.perf_counter()
+    succeeded, failed = run_batch(
+        files, manifest, args.output_dir, args.workers,
+        write_excel=not args.no_excel,
+        excel_mode=args.excel_mode,
+        columnar_format=args.columnar,
+        chart_mode=args.chart_mode,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        pier_cache_dir=None if args.no_cache else args.pier_cache_dir,
+        harmonics=args.harmonics,
+        fit_mode=args.fit_mode,
+        backend=args.backend,
+        report_workers=args.report_workers,
+        report_executor=args.report_executor,
+    )
+    print(f"[Info] Processed {len(succeeded)} of {len(files)} surveys in {time.perf_counter() - start:.1f}s")
+    if succeeded:
+        trace_path = os.path.join(args.output_dir, TRACE_FILE)
+        print(f"[Info] Stage timings: python run_trace.py {trace_path} --last {len(succeeded)}")
+
+    for file_path, reason in failed:
+        print(f"[Failed] {file_path}: {reason}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
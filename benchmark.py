@@ -0,0 +1,177 @@
+"""
+Benchmark harness for the report pipeline.
+
+Generates synthetic surveys (see synthetic_survey.py) over a grid of
+position and pier counts, runs process_file on each and records the time
+spent in ingestion, computation, Excel write and PDF generation from the
+run trace. Each case runs in a fresh process so peak RSS is per case.
+Results are appended to a CSV so runs from different versions can be compared.
+
+Usage:
+    python benchmark.py                                   # 8/24/360 positions x 4/50/500 piers
+    python benchmark.py --positions 8 24 --piers 4 50 --repeat 3
+    python benchmark.py --label after --compare benchmark_results.csv
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+import pandas as pd
+
+import module5
+from run_trace import RunTrace
+from runout_engine import compute_runout
+from synthetic_survey import write_survey
+
+
+DEFAULT_POSITIONS = [8, 24, 360]
+DEFAULT_PIERS = [4, 50, 500]
+
+# Benchmark column -> RunTrace stage. The Excel write and the report are
+# pipeline stages running alongside the pier loop, so excel_s and pdf_s
+# overlap each other within total_s.
+STAGE_COLUMNS = {
+    'ingest_s': 'read_survey',
+    'compute_s': 'compute',
+    'excel_s': 'excel_write',
+    'pdf_s': 'report',
+}
+
+CASE_KEYS = ['positions', 'piers', 'chart_mode', 'excel_mode']
+
+
+def survey_accuracy(survey_path, truth, positions):
+    """Largest eccentricity (mm) and phase (degrees) error against the generated truth"""
+    survey = module5.read_survey(survey_path)
+    results = compute_runout(survey['measurements'], positions)
+    ecc_error = np.abs(results['Eccentricity (mm)'] - truth['Eccentricity (mm)'].to_numpy())
+    phase_error = np.abs((results['Phase Angle'] - truth['Phase Angle'].to_numpy() + 180) % 360 - 180)
+    return float(ecc_error.max()), float(phase_error.max())
+
+
+def run_case(work_dir, positions, piers, repeat=1, chart_mode="raster", excel_mode="standard", seed=0):
+    """
+    Benchmark one grid point, returns a result row.
+    Stage times are the best of `repeat` runs.
+    """
+    case = f"{positions}x{piers}"
+    survey_path = os.path.join(work_dir, f"survey_{case}.xlsx")
+    truth = write_survey(survey_path, positions=positions, piers=piers, seed=seed)
+
+    best = None
+    for _ in range(repeat):
+        trace = RunTrace(case)
+        start = time.perf_counter()
+        module5.process_file(
+            survey_path, "Benchmark", f"Synthetic {case}", "-", datetime.now().strftime("%d/%m/%Y"),
+            positions, str(piers), min(positions, 21),
+            output_file=os.path.join(work_dir, f"{case}_processed.xlsx"),
+            pdf_path=os.path.join(work_dir, f"{case}_report.pdf"),
+            interactive=False, chart_mode=chart_mode, excel_mode=excel_mode, trace=trace,
+        )
+        stage_wall = {row['stage']: row['wall_s'] for row in trace.summary()}
+        timings = {column: stage_wall.get(stage, np.nan) for column, stage in STAGE_COLUMNS.items()}
+        timings['total_s'] = time.perf_counter() - start
+        if best is None:
+            best = timings
+        else:
+            best = {column: min(best[column], timings[column]) for column in best}
+
+    ecc_error, phase_error = survey_accuracy(survey_path, truth, positions)
+    return {
+        'positions': positions,
+        'piers': piers,
+        'chart_mode': chart_mode,
+        'excel_mode': excel_mode,
+        'repeat': repeat,
+        **best,
+        'peak_rss_mb': trace.record()['peak_rss_mb'],
+        'ecc_max_error': ecc_error,
+        'phase_max_error': phase_error,
+    }
+
+
+def run_grid(work_dir, positions_list, piers_list, **options):
+    os.makedirs(work_dir, exist_ok=True)
+    rows = []
+    for positions in positions_list:
+        for piers in piers_list:
+            print(f"[Info] Benchmarking {positions} positions x {piers} piers...")
+            # A fresh process per case keeps the peak RSS of one case from leaking into the next
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                try:
+                    rows.append(executor.submit(run_case, work_dir, positions, piers, **options).result())
+                except Exception as e:
+                    print(f"[Error] {positions}x{piers}: {e}")
+    return pd.DataFrame(rows)
+
+
+def save_results(results, output_path):
+    """Append the results to the CSV, writing the header only for a new file"""
+    exists = os.path.exists(output_path)
+    results.to_csv(output_path, mode='a', header=not exists, index=False)
+
+
+def compare_results(results, baseline_path, baseline_label=None):
+    """Speedup of each stage against a previous results CSV (baseline time / new time)"""
+    baseline = pd.read_csv(baseline_path)
+    if baseline_label is not None:
+        baseline = baseline[baseline['label'] == baseline_label]
+    # Latest baseline run for each case
+    baseline = baseline.drop_duplicates(subset=CASE_KEYS, keep='last')
+
+    merged = results.merge(baseline, on=CASE_KEYS, suffixes=('', '_base'))
+    columns = list(STAGE_COLUMNS) + ['total_s']
+    speedup = merged[CASE_KEYS].copy()
+    for column in columns:
+        speedup[column.replace('_s', '_x')] = merged[f"{column}_base"] / merged[column]
+    return speedup
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the report pipeline on synthetic surveys.")
+    parser.add_argument("--positions", type=int, nargs="+", default=DEFAULT_POSITIONS, help="Position counts to test")
+    parser.add_argument("--piers", type=int, nargs="+", default=DEFAULT_PIERS, help="Pier counts to test")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case, the best time is kept")
+    parser.add_argument("--chart-mode", choices=module5.CHART_MODES, default="raster")
+    parser.add_argument("--excel-mode", choices=module5.EXCEL_MODES, default="standard")
+    parser.add_argument("--work-dir", default="benchmark_runs", help="Directory for the synthetic surveys and outputs")
+    parser.add_argument("--output", default="benchmark_results.csv", help="CSV the results are appended to")
+    parser.add_argument("--label", default=None, help="Name for this run in the results file (default: timestamp)")
+    parser.add_argument("--compare", default=None, help="Results CSV to compare against")
+    parser.add_argument("--compare-label", default=None, help="Only compare against rows with this label")
+    args = parser.parse_args(argv)
+
+    results = run_grid(args.work_dir, args.positions, args.piers, repeat=args.repeat,
+                       chart_mode=args.chart_mode, excel_mode=args.excel_mode)
+    if results.empty:
+        print("[Error] No benchmark case completed.")
+        return 1
+
+    timestamp = datetime.now().isoformat(timespec='seconds')
+    results.insert(0, 'label', args.label or timestamp)
+    results.insert(1, 'timestamp', timestamp)
+    results.insert(2, 'version', module5.APP_VERSION)
+
+    with pd.option_context('display.width', 160, 'display.max_columns', None):
+        print(results.drop(columns=['label', 'timestamp', 'version']).to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+        if args.compare:
+            speedup = compare_results(results, args.compare, args.compare_label)
+            print(f"\nSpeedup against {args.compare} (baseline time / new time):")
+            print(speedup.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+    save_results(results, args.output)
+    print(f"[Success] Results appended to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
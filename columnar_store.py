@@ -0,0 +1,123 @@
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+# Arrow IPC files can be memory-mapped without a copy, Parquet is smaller on disk
+STORE_FORMATS = {"arrow": ".arrow", "parquet": ".parquet"}
+
+# Per-position curve columns kept in the long table (Distortion is a copy of AH)
+CURVE_TABLE_COLUMNS = ['Position', 'Measurement', 'Data Measured', 'Run Out',
+                       'AA', 'AB', 'AC', 'AD', 'AE', 'AF', 'AG', 'AH', 'AI']
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("The columnar result store needs pyarrow (pip install pyarrow)")
+
+
+def _sheet_pier(sheet_name, idx):
+    prefix, _, number = sheet_name.rpartition('_')
+    if prefix == 'Sheet' and number.isdigit():
+        return int(number)
+    return idx + 1
+
+
+def _arrow_safe(df):
+    # Metadata rows come straight from the survey sheet as object columns
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object:
+            numeric = pd.to_numeric(df[col], errors='coerce')
+            if numeric.notna().sum() == df[col].notna().sum():
+                df[col] = numeric
+            else:
+                df[col] = df[col].astype(str)
+    return df
+
+
+def curves_to_long_table(all_sheet_data):
+    """Stack the per-pier Sheet_N frames into one long table keyed by Pier"""
+    frames = []
+    for idx, (sheet_name, sheet_df) in enumerate(all_sheet_data.items()):
+        frame = sheet_df[[c for c in CURVE_TABLE_COLUMNS if c in sheet_df.columns]].copy()
+        frame.insert(0, 'Pier', _sheet_pier(sheet_name, idx))
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=['Pier'] + CURVE_TABLE_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def long_table_to_curves(curves_df):
+    """Split the long table back into {Sheet_N: frame} with the workbook column order"""
+    all_sheet_data = {}
+    for pier, frame in curves_df.groupby('Pier', sort=True):
+        sheet_df = frame.drop(columns='Pier').reset_index(drop=True)
+        sheet_df.insert(3, 'Distortion', sheet_df['AH'])
+        all_sheet_data[f"Sheet_{int(pier)}"] = sheet_df
+    return all_sheet_data
+
+
+def _table_path(store_dir, name, fmt):
+    return os.path.join(store_dir, f"{name}{STORE_FORMATS[fmt]}")
+
+
+def write_columnar_store(store_dir, all_sheet_data, summary_df, Temp_df, fmt="arrow"):
+    """
+    Write the results as three tables: curves (long, keyed by Pier), summary and temp.
+    fmt: "arrow" (uncompressed Arrow IPC, memory-mappable) or "parquet"
+    """
+    _require_pyarrow()
+    if fmt not in STORE_FORMATS:
+        raise ValueError(f"Unknown store format {fmt!r}, expected one of {sorted(STORE_FORMATS)}")
+
+    os.makedirs(store_dir, exist_ok=True)
+    tables = {
+        'curves': curves_to_long_table(all_sheet_data),
+        'summary': summary_df,
+        'temp': Temp_df,
+    }
+    for name, df in tables.items():
+        table = pa.Table.from_pandas(_arrow_safe(df), preserve_index=False)
+        path = _table_path(store_dir, name, fmt)
+        if fmt == "parquet":
+            pq.write_table(table, path)
+        else:
+            with pa.OSFile(path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+    return store_dir
+
+
+def _detect_format(store_dir):
+    for fmt in STORE_FORMATS:
+        if os.path.exists(_table_path(store_dir, 'curves', fmt)):
+            return fmt
+    raise FileNotFoundError(f"No columnar result store found in {store_dir}")
+
+
+def read_columnar_table(store_dir, name, memory_map=True):
+    """Read one table ('curves', 'summary' or 'temp') of a store as a pyarrow Table"""
+    _require_pyarrow()
+    fmt = _detect_format(store_dir)
+    path = _table_path(store_dir, name, fmt)
+    if fmt == "parquet":
+        return pq.read_table(path, memory_map=memory_map)
+    source = pa.memory_map(path, 'r') if memory_map else pa.OSFile(path, 'rb')
+    return pa.ipc.open_file(source).read_all()
+
+
+def read_columnar_store(store_dir, memory_map=True):
+    """Load a store back into (all_sheet_data, summary_df, Temp_df) as process_file builds them"""
+    curves_df = read_columnar_table(store_dir, 'curves', memory_map).to_pandas()
+    summary_df = read_columnar_table(store_dir, 'summary', memory_map).to_pandas()
+    Temp_df = read_columnar_table(store_dir, 'temp', memory_map).to_pandas()
+    return long_table_to_curves(curves_df), summary_df, Temp_df
@@ -0,0 +1,372 @@
+"""
+Live acquisition mode: eccentricity and phase angle updated while the kiln turns.
+
+Samples arrive one reading at a time from a pluggable source (serial port,
+TCP socket or a file replay for testing), in position order: the first
+sample is position 1 and the positions wrap every revolution.
+
+RunningRunout keeps the cos/sin-weighted sums that process_file builds as
+SUM_AB and SUM_AC over the last revolution. A new sample replaces the
+previous reading at its position, so XX, YY and ZZ update in constant time:
+
+    SUM_AB = sum(cos(a) * (max - v)) = max * sum(cos(a)) - sum(v * cos(a))
+
+The revolution maximum comes from a monotonic deque (amortised O(1)).
+
+Usage:
+    python live_mode.py --positions 64 --replay capture.csv --rate 50
+    python live_mode.py --positions 64 --tcp 192.168.1.20:5000
+    python live_mode.py --positions 64 --serial COM3 --baud 9600
+    python live_mode.py --positions 64 --replay capture.csv --console
+"""
+import argparse
+import math
+import queue
+import socket
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from runout_engine import angle_basis
+
+try:
+    import serial
+except ImportError:
+    serial = None
+
+
+# ===== Running Fourier sums =====
+class RunningRunout:
+    """
+    X, Y, eccentricity and phase angle of the last `positions` samples.
+    Uses the same angle grid as compute_runout so a completed revolution
+    matches the report for that revolution.
+    """
+
+    def __init__(self, positions):
+        self.positions = int(positions)
+        if self.positions < 3:
+            raise ValueError("positions must be at least 3")
+        basis = angle_basis(self.positions)
+        self.cos = basis.cos[:self.positions]
+        self.sin = basis.sin[:self.positions]
+        self.values = np.full(self.positions, np.nan)
+        self.count = 0
+
+        # Sums over the positions that currently hold a reading
+        self.sum_cos = 0.0
+        self.sum_sin = 0.0
+        self.sum_value_cos = 0.0
+        self.sum_value_sin = 0.0
+
+        # (sample number, value), values decreasing: the front is the revolution maximum
+        self.max_queue = deque()
+
+    def add(self, value):
+        """Add one reading at the next position, O(1)"""
+        p = self.count % self.positions
+        old = self.values[p]
+        if not math.isnan(old):
+            self.sum_cos -= self.cos[p]
+            self.sum_sin -= self.sin[p]
+            self.sum_value_cos -= old * self.cos[p]
+            self.sum_value_sin -= old * self.sin[p]
+
+        self.values[p] = value
+        if not math.isnan(value):
+            self.sum_cos += self.cos[p]
+            self.sum_sin += self.sin[p]
+            self.sum_value_cos += value * self.cos[p]
+            self.sum_value_sin += value * self.sin[p]
+
+            while self.max_queue and self.max_queue[-1][1] <= value:
+                self.max_queue.pop()
+            self.max_queue.append((self.count, value))
+
+        self.count += 1
+        while self.max_queue and self.max_queue[0][0] <= self.count - 1 - self.positions:
+            self.max_queue.popleft()
+
+        # Rebuild the sums once per revolution so rounding error cannot build up over a long run
+        if self.count % self.positions == 0:
+            self._resum()
+
+    def _resum(self):
+        valid = ~np.isnan(self.values)
+        self.sum_cos = float(self.cos[valid].sum())
+        self.sum_sin = float(self.sin[valid].sum())
+        self.sum_value_cos = float((self.values[valid] * self.cos[valid]).sum())
+        self.sum_value_sin = float((self.values[valid] * self.sin[valid]).sum())
+
+    @property
+    def maximum(self):
+        return self.max_queue[0][1] if self.max_queue else np.nan
+
+    def result(self):
+        """Current {'X', 'Y', 'Eccentricity (mm)', 'Phase Angle', 'Samples'}, NaN until a reading arrives"""
+        peak = self.maximum
+        if math.isnan(peak):
+            return {'X': np.nan, 'Y': np.nan, 'Eccentricity (mm)': np.nan, 'Phase Angle': np.nan, 'Samples': self.count}
+
+        xx = 2 / self.positions * (peak * self.sum_cos - self.sum_value_cos)
+        yy = 2 / self.positions * (peak * self.sum_sin - self.sum_value_sin)
+        zz = math.sqrt(xx ** 2 + yy ** 2)
+        angle = math.degrees(math.atan2(yy, xx)) % 360
+        return {'X': xx, 'Y': yy, 'Eccentricity (mm)': zz, 'Phase Angle': angle, 'Samples': self.count}
+
+    def run_out(self):
+        """Run Out of the current revolution by position (0 where there is no reading, like the report)"""
+        return np.where(np.isnan(self.values), 0.0, self.maximum - self.values)
+
+
+# ===== Sample sources =====
+def parse_sample(line):
+    """Reading from one text line: the last comma/whitespace separated field, None for headers and blanks"""
+    fields = line.replace(',', ' ').split()
+    if not fields:
+        return None
+    try:
+        return float(fields[-1])
+    except ValueError:
+        return None
+
+
+class FileReplaySource:
+    """Replay a recorded log (one reading per line, last field), optionally at a fixed sample rate"""
+
+    def __init__(self, path, rate=None):
+        self.path = path
+        self.rate = rate
+        self.closed = False
+
+    def __iter__(self):
+        interval = 1 / self.rate if self.rate else 0
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if self.closed:
+                    return
+                value = parse_sample(line)
+                if value is None:
+                    continue
+                yield value
+                if interval:
+                    time.sleep(interval)
+
+    def close(self):
+        self.closed = True
+
+
+class TcpSource:
+    """Line-oriented readings from a TCP socket, e.g. a rig's data server"""
+
+    def __init__(self, host, port, timeout=5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.settimeout(None)
+
+    def __iter__(self):
+        with self.sock.makefile('r', encoding='utf-8', errors='replace') as stream:
+            for line in stream:
+                value = parse_sample(line)
+                if value is not None:
+                    yield value
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class SerialSource:
+    """Line-oriented readings from a serial port (needs pyserial)"""
+
+    def __init__(self, port, baudrate=9600):
+        if serial is None:
+            raise ImportError("Serial acquisition needs pyserial (pip install pyserial)")
+        self.port = serial.Serial(port, baudrate, timeout=1)
+
+    def __iter__(self):
+        while self.port.is_open:
+            try:
+                line = self.port.readline().decode('ascii', errors='replace')
+            except Exception:
+                return
+            value = parse_sample(line)
+            if value is not None:
+                yield value
+
+    def close(self):
+        self.port.close()
+
+
+def start_acquisition(source, samples, stop_event):
+    """Read the source on a daemon thread into the samples queue; ('end', None) marks the end"""
+
+    def run():
+        try:
+            for value in source:
+                if stop_event.is_set():
+                    break
+                samples.put(('sample', value))
+        except Exception as e:
+            samples.put(('error', str(e)))
+        samples.put(('end', None))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def drain_samples(samples, runout):
+    """Feed every queued sample into runout, returns (status, message) once the source ends"""
+    try:
+        while True:
+            kind, value = samples.get_nowait()
+            if kind == 'sample':
+                runout.add(value)
+            else:
+                return kind, value
+    except queue.Empty:
+        return None, None
+
+
+# ===== Live window =====
+def run_live_window(source, positions, refresh_ms=200):
+    """Tk window with the live numbers and radar chart, redrawn every refresh_ms"""
+    import tkinter as tk
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+    runout = RunningRunout(positions)
+    samples = queue.Queue()
+    stop_event = threading.Event()
+    start_acquisition(source, samples, stop_event)
+
+    root = tk.Tk()
+    root.title("Live Runout - Roller shaft deflection")
+    root.geometry("520x640")
+
+    title_label = tk.Label(root, text="Live Roller shaft deflection", font=('Arial', 16, 'bold'), bg='#2c3e50', fg='white')
+    title_label.pack(fill='x')
+
+    values_frame = tk.Frame(root)
+    values_frame.pack(pady=10)
+    value_labels = {}
+    for row, name in enumerate(['Eccentricity (mm)', 'Phase Angle', 'X', 'Y', 'Samples']):
+        tk.Label(values_frame, text=f"{name}:", font=('Arial', 11)).grid(row=row, column=0, sticky='w', padx=10)
+        value_labels[name] = tk.Label(values_frame, text="-", font=('Arial', 11, 'bold'), width=12, anchor='e')
+        value_labels[name].grid(row=row, column=1, sticky='e', padx=10)
+    status_label = tk.Label(root, text="Waiting for samples...", font=('Arial', 9), fg='gray')
+    status_label.pack()
+
+    figure = Figure(figsize=(4.5, 4.5), dpi=100)
+    ax = figure.add_subplot(111, polar=True)
+    ax.set_theta_offset(np.pi / 2)
+    ax.set_theta_direction(-1)
+    ax.grid(True, linestyle='--', alpha=0.7, linewidth=1)
+    angles = np.linspace(0, 2 * np.pi, positions, endpoint=False)
+    radar_line, = ax.plot([], [], color='blue', linewidth=2, label='Run Out')
+    ax.legend(loc='upper right', bbox_to_anchor=(1.2, 1.1), fontsize=9)
+    canvas = FigureCanvasTkAgg(figure, master=root)
+    canvas.get_tk_widget().pack(fill='both', expand=True)
+
+    def refresh():
+        status, message = drain_samples(samples, runout)
+
+        result = runout.result()
+        for name, label in value_labels.items():
+            value = result[name]
+            if name == 'Samples':
+                label.config(text=str(value))
+            else:
+                label.config(text="-" if math.isnan(value) else f"{value:.3f}")
+
+        if runout.count:
+            run_out = runout.run_out()
+            radar_line.set_data(np.append(angles, angles[0]), np.append(run_out, run_out[0]))
+            ax.set_ylim(0, max(float(run_out.max()), 1e-6) * 1.1)
+            canvas.draw_idle()
+            status_label.config(text=f"Revolution {runout.count // positions + 1}, position {runout.count % positions + 1}")
+
+        if status == 'error':
+            status_label.config(text=f"Source error: {message}", fg='red')
+        elif status == 'end':
+            status_label.config(text="Source finished", fg='gray')
+        else:
+            root.after(refresh_ms, refresh)
+
+    def on_close():
+        stop_event.set()
+        source.close()
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
+    root.after(refresh_ms, refresh)
+    root.mainloop()
+
+
+def run_console(source, positions, refresh_ms=200):
+    """Print the live numbers every refresh_ms, for rigs without a display"""
+    runout = RunningRunout(positions)
+    samples = queue.Queue()
+    stop_event = threading.Event()
+    start_acquisition(source, samples, stop_event)
+
+    try:
+        while True:
+            time.sleep(refresh_ms / 1000)
+            status, message = drain_samples(samples, runout)
+            result = runout.result()
+            print(f"[Live] samples={result['Samples']} eccentricity={result['Eccentricity (mm)']:.3f} mm "
+                  f"phase={result['Phase Angle']:.2f} X={result['X']:.3f} Y={result['Y']:.3f}")
+            if status == 'error':
+                print(f"[Error] Source error: {message}")
+                return 1
+            if status == 'end':
+                return 0
+    except KeyboardInterrupt:
+        stop_event.set()
+        source.close()
+        return 0
+
+
+def open_source(args):
+    if args.replay:
+        return FileReplaySource(args.replay, rate=args.rate)
+    if args.tcp:
+        host, _, port = args.tcp.rpartition(':')
+        return TcpSource(host, int(port))
+    return SerialSource(args.serial, args.baud)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Live eccentricity and phase angle from a streaming measurement source.")
+    parser.add_argument("--positions", type=int, required=True, help="Samples per revolution")
+    source_group = parser.add_mutually_exclusive_group(required=True)
+    source_group.add_argument("--replay", help="Replay a recorded log file (one reading per line, last field)")
+    source_group.add_argument("--tcp", help="host:port of a line-oriented TCP data server")
+    source_group.add_argument("--serial", help="Serial port, e.g. COM3 or /dev/ttyUSB0")
+    parser.add_argument("--baud", type=int, default=9600, help="Serial baud rate")
+    parser.add_argument("--rate", type=float, default=None, help="Replay sample rate in samples per second (default: as fast as possible)")
+    parser.add_argument("--refresh-ms", type=int, default=200, help="Display refresh interval in milliseconds")
+    parser.add_argument("--console", action="store_true", help="Print the numbers instead of opening a window")
+    args = parser.parse_args(argv)
+
+    try:
+        source = open_source(args)
+    except Exception as e:
+        print(f"[Error] Could not open source: {e}")
+        return 1
+
+    if args.console:
+        return run_console(source, args.positions, args.refresh_ms)
+    run_live_window(source, args.positions, args.refresh_ms)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
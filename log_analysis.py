@@ -0,0 +1,180 @@
+"""
+Rolling-window eccentricity over long continuous measurement logs.
+
+Laser rigs log readings continuously over many revolutions instead of one
+revolution per pier column. This reads such a log in chunks, cuts it into
+windows of one or more revolutions that slide by a fixed number of samples,
+and runs each window through compute_runout, so every window gets the same
+X, Y, Eccentricity (mm) and Phase Angle as a pier in the report.
+
+The log is a CSV with one reading per row, sampled at `positions` evenly
+spaced points per revolution. The first row (after --skip) is position 1.
+Only one chunk plus one window of samples is held in memory at a time,
+overlapping windows are copied out in batches of bounded size, and results
+are appended to the output CSV as they are computed, so memory use
+does not grow with the length of the log.
+
+Usage:
+    python log_analysis.py capture.csv --value-column reading --positions 360
+    python log_analysis.py capture.csv --value-column reading --positions 360 \\
+        --window-revolutions 5 --step 90 --time-column timestamp -o capture_runout.csv
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from runout_engine import compute_runout
+
+
+# Per-window values written to the output, as they appear on the Summary sheet
+RESULT_COLUMNS = ['X', 'Y', 'Eccentricity (mm)', 'Phase Angle', 'Runout', 'Local Shell Deformation']
+
+# Samples copied out per batch of windows (windows x window length), about 16 MB of floats
+WINDOW_BATCH_SAMPLES = 2_000_000
+
+
+def iter_log_chunks(log_path, value_column, time_column=None, chunksize=100_000, skip=0):
+    """Yield (values, times) arrays from the log, one chunk at a time"""
+    usecols = [value_column] + ([time_column] if time_column else [])
+    reader = pd.read_csv(log_path, usecols=usecols, chunksize=chunksize,
+                         skiprows=range(1, skip + 1) if skip else None)
+    for chunk in reader:
+        values = pd.to_numeric(chunk[value_column], errors='coerce').to_numpy(dtype=float)
+        times = chunk[time_column].to_numpy() if time_column else None
+        yield values, times
+
+
+def window_matrix(samples, local_starts, global_starts, positions, window_revolutions):
+    """
+    (positions x windows) matrix for compute_runout: each window's readings
+    rotated so row 0 is position 1, averaged per position over its revolutions.
+    local_starts index into samples, global_starts count from the start of the log.
+    """
+    length = positions * window_revolutions
+    windows = sliding_window_view(samples, length)[local_starts]
+    windows = windows.reshape(len(local_starts), window_revolutions, positions)
+
+    # Sample i of a revolution starting at global index g sits at position (g + i) % positions
+    shift = np.asarray(global_starts) % positions
+    index = (np.arange(positions)[None, :] - shift[:, None]) % positions
+    aligned = np.take_along_axis(windows, np.broadcast_to(index[:, None, :], windows.shape), axis=2)
+
+    counts = (~np.isnan(aligned)).sum(axis=1)
+    totals = np.nansum(aligned, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        averaged = np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+    return averaged.T
+
+
+def rolling_runout(chunks, positions, window_revolutions=1, step=None):
+    """
+    Sliding-window runout over a stream of (values, times) chunks.
+    positions: samples per revolution
+    window_revolutions: revolutions per window (readings are averaged per position)
+    step: samples between window starts (default one revolution, i.e. no overlap)
+    Yields one DataFrame of window results per batch of windows, each batch
+    holding at most WINDOW_BATCH_SAMPLES samples.
+    """
+    positions = int(positions)
+    window_revolutions = int(window_revolutions)
+    step = int(step or positions)
+    if positions < 3:
+        raise ValueError("positions must be at least 3")
+    if window_revolutions < 1 or step < 1:
+        raise ValueError("window_revolutions and step must be at least 1")
+
+    length = positions * window_revolutions
+    batch = max(WINDOW_BATCH_SAMPLES // length, 1)
+    buffer = np.empty(0)
+    time_buffer = None
+    buffer_start = 0      # Log sample index of buffer[0]
+    next_start = 0        # Log sample index where the next window starts
+    window_number = 0
+
+    for values, times in chunks:
+        buffer = np.concatenate([buffer, values])
+        if times is not None:
+            time_buffer = times if time_buffer is None else np.concatenate([time_buffer, times])
+
+        last_start = buffer_start + len(buffer) - length
+        if next_start <= last_start:
+            starts = np.arange(next_start, last_start + 1, step)
+            for first in range(0, len(starts), batch):
+                batch_starts = starts[first:first + batch]
+                local = batch_starts - buffer_start
+                results = compute_runout(window_matrix(buffer, local, batch_starts, positions, window_revolutions),
+                                         positions)
+
+                frame = pd.DataFrame({
+                    'Window': np.arange(window_number + 1, window_number + len(batch_starts) + 1),
+                    'Start Sample': batch_starts,
+                    'End Sample': batch_starts + length - 1,
+                    'Revolution': batch_starts / positions + 1,
+                })
+                if time_buffer is not None:
+                    frame['Start Time'] = time_buffer[local]
+                    frame['End Time'] = time_buffer[local + length - 1]
+                for name in RESULT_COLUMNS:
+                    frame[name] = results[name]
+
+                window_number += len(batch_starts)
+                yield frame[results['valid']]
+            next_start = int(starts[-1]) + step
+
+        # Keep only the samples the next window still needs
+        drop = min(next_start - buffer_start, len(buffer))
+        buffer = buffer[drop:]
+        if time_buffer is not None:
+            time_buffer = time_buffer[drop:]
+        buffer_start += drop
+
+
+def analyse_log(log_path, output_path, positions, value_column, time_column=None,
+                window_revolutions=1, step=None, chunksize=100_000, skip=0):
+    """Stream a log through rolling_runout into output_path (CSV), returns the number of windows written"""
+    chunks = iter_log_chunks(log_path, value_column, time_column, chunksize, skip)
+
+    written = 0
+    # Write to a temporary name so a failed run never leaves a half-written result behind
+    temp_path = f"{output_path}.tmp"
+    with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+        for frame in rolling_runout(chunks, positions, window_revolutions, step):
+            frame.to_csv(f, header=(written == 0), index=False)
+            written += len(frame)
+    os.replace(temp_path, output_path)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rolling-window eccentricity and phase angle over a continuous measurement log.")
+    parser.add_argument("log", help="CSV log with one reading per row")
+    parser.add_argument("--value-column", required=True, help="Column holding the readings")
+    parser.add_argument("--positions", type=int, required=True, help="Samples per revolution")
+    parser.add_argument("--time-column", default=None, help="Optional timestamp column copied to the window results")
+    parser.add_argument("--window-revolutions", type=int, default=1, help="Revolutions per window, averaged per position")
+    parser.add_argument("--step", type=int, default=None, help="Samples between window starts (default: one revolution)")
+    parser.add_argument("--skip", type=int, default=0, help="Samples to skip before the first position 1")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Rows read from the log at a time")
+    parser.add_argument("-o", "--output", default=None, help="Result CSV (default: <log>_runout.csv)")
+    args = parser.parse_args(argv)
+
+    output = args.output or f"{os.path.splitext(args.log)[0]}_runout.csv"
+    try:
+        written = analyse_log(args.log, output, args.positions, args.value_column, args.time_column,
+                              args.window_revolutions, args.step, args.chunksize, args.skip)
+    except (ValueError, KeyError) as e:
+        print(f"[Error] {e}")
+        return 1
+
+    if written == 0:
+        print("[Warning] Log is shorter than one window, no results written")
+    print(f"[Success] {written} windows written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,516 +1,1817 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
 import os
+import io
+import multiprocessing
+import queue
+import threading
+import time
+import hashlib
 import pandas as pd
 import numpy as np
 from fpdf import FPDF
-from openpyxl import load_workbook
+from fpdf.enums import CharVPos, TextMode
+from fpdf.fonts import CoreFont
+from fpdf.util import escape_parens
+from openpyxl import Workbook
 from tkcalendar import DateEntry
 import webbrowser
-import matplotlib.pyplot as plt
-import glob
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from runout_engine import compute_runout, BACKENDS, CURVE_COLUMNS, DEFAULT_HARMONICS, FIT_MODES
+from columnar_store import write_columnar_store, read_columnar_store
+from run_trace import RunTrace, TRACE_FILE, trace_stage, load_records, format_summary
 
 
+APP_VERSION = "1.0"
 
-def process_file(file_path, company_name, equipment_name, feed_rate, date_of_measurement, user_inp, no_of_pier, radar_positions):
-    angle_increment = 360 / int(user_inp)
+# Report chart styles: matplotlib PNGs or native FPDF vector drawing
+CHART_MODES = ("raster", "vector")
 
+# Excel output: pandas/openpyxl in a background thread, or write-only streaming per pier
+EXCEL_MODES = ("standard", "streaming")
 
-    try:
-        data = pd.read_excel(file_path, sheet_name=0)
-        filtered_data = data[data['CHAIRPAD NO'].apply(lambda x: str(x).isnumeric())]
+# Parallel raster charts: spawned worker processes, or threads of this process
+# (no start-up cost, for long-lived services; each thread has its own renderer)
+CHART_EXECUTORS = ("process", "thread")
 
-        if filtered_data.empty:
-            messagebox.showerror("Data Error", "No valid CHAIRPAD NO data found in the Excel file.")
-            return
 
-        filtered_data.columns = [chr(65 + i) for i in range(len(filtered_data.columns))]
-    except Exception as e:
-        messagebox.showerror("File Error", f"Could not read Excel file: {str(e)}")
-        return
+
+class ProcessingError(Exception):
+    """Raised in place of an error dialog when running without the GUI."""
+
+
+def show_error(title, message, interactive=True):
+    if interactive:
+        messagebox.showerror(title, message)
+    else:
+        raise ProcessingError(f"{title}: {message}")
 
 
-    position = list(range(1, int(user_inp) + 1)) + [1]
-    measurement = [i * angle_increment for i in range(int(user_inp))] + [360]
+def show_errors(errors, interactive=True):
+    """Show collected (title, message) errors; without the GUI the first is raised and the rest printed"""
+    if not interactive:
+        for title, message in errors[1:]:
+            print(f"[Error] {title}: {message}")
+    for title, message in errors:
+        show_error(title, message, interactive)
 
 
+def show_info(title, message, interactive=True):
+    if interactive:
+        messagebox.showinfo(title, message)
+    else:
+        print(f"[Info] {message}")
+
+
+class ProcessingCancelled(Exception):
+    """Raised between piers when the user cancels a running job."""
+
+
+def check_cancelled(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise ProcessingCancelled("Processing cancelled by user")
+
+
+def open_pdf(pdf_path):
     try:
-        distance_row = data.iloc[68, 1:].values
-        cumulative_distance_row = data.iloc[69, 1:].values
-        Diff_temp = data.iloc[70, 1:].values - data.iloc[71, 1:].values
-        Min_temp = data.iloc[70, 1:].values
-        Max_temp = data.iloc[71, 1:].values
-        AVG_temp = data.iloc[72, 1:].values
-    except IndexError:
-        messagebox.showerror("Data Error", "Excel file does not have the required rows (68-72). Please check your file format.")
-        return
+        os.startfile(pdf_path)
+    except:
+        webbrowser.open(pdf_path)
 
 
-    summary_data = []
-    Temp_data = []
-    all_sheet_data = {}
 
+class SurveyError(Exception):
+    """Survey workbook could not be read; carries the dialog title and message."""
 
-    output_file = "processed_data_with_summary.xlsx"
+    def __init__(self, title, message):
+        super().__init__(f"{title}: {message}")
+        self.title = title
+        self.message = message
 
-    num_columns = len(filtered_data.columns[1:])
 
-    if num_columns == 0:
-        messagebox.showerror("Data Error", "No data columns found after filtering.")
-        return
+# Per-pier values copied from compute_runout into the Summary sheet
+SUMMARY_RESULT_COLUMNS = ['X', 'Y', 'Eccentricity (mm)', 'Phase Angle', 'Runout', 'Local Shell Deformation']
+
+# Bump when the parsed layout changes so stale cache entries are ignored
+SURVEY_CACHE_VERSION = 1
 
-    for i, col in enumerate(filtered_data.columns[1:]):
+
+def user_cache_dir(name):
+    """Per-user cache directory for this application (LOCALAPPDATA on Windows, XDG_CACHE_HOME or ~/.cache elsewhere)"""
+    base = os.environ.get('LOCALAPPDATA') if os.name == 'nt' else os.environ.get('XDG_CACHE_HOME')
+    base = base or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "AllanSmithRunout", name)
+
+
+def prune_cache_dir(cache_dir, max_bytes, label):
+    """Remove the least recently used .npz entries in cache_dir until they fit in max_bytes"""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_file() and entry.name.endswith(".npz"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
         try:
-            col_data = filtered_data[col].tolist()
+            os.remove(path)
+            total -= size
+            removed += 1
+        except OSError:
+            pass
+    if removed:
+        print(f"[Info] Removed {removed} old {label} entries")
 
-            if len(col_data) == 0:
-                print(f"[Warning] Column {col} is empty, skipping...")
-                continue
 
-            data_measured = col_data + [col_data[0]]
-            data_measured = pd.to_numeric(data_measured, errors='coerce')
+SURVEY_CACHE_DIR = user_cache_dir("survey_cache")
 
-            data_measured_clean = [x for x in data_measured if not np.isnan(x)]
+# Oldest (least recently used) parsed surveys are removed once the cache grows past this
+SURVEY_CACHE_MAX_MB = 256
+
+SURVEY_ARRAYS = ['measurements', 'distance', 'cumulative_distance', 'min_temp', 'max_temp', 'avg_temp']
+
+
+def file_sha256(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-            if len(data_measured_clean) == 0:
-                print(f"[Warning] Column {col} has no valid numeric data, skipping...")
-                continue
 
-            max_measured = np.nanmax(data_measured)
-            shell_run_out = [max_measured - value if not np.isnan(value) else 0 for value in data_measured]
+def read_survey(file_path, cache_dir=None):
+    """
+    Parse a raw survey workbook into the measurement block and metadata rows.
+    Returns {'columns', 'measurements' (positions x piers), 'distance',
+    'cumulative_distance', 'min_temp', 'max_temp', 'avg_temp'}.
+    With cache_dir set, the parsed arrays are kept as .npz keyed by the file's
+    content hash, so an unchanged survey is never parsed from Excel twice;
+    the least recently used entries are pruned past SURVEY_CACHE_MAX_MB.
+    """
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(cache_dir, f"{file_sha256(file_path)}_v{SURVEY_CACHE_VERSION}.npz")
+        if os.path.exists(cache_path):
+            try:
+                with np.load(cache_path) as cached:
+                    survey = {name: cached[name] for name in SURVEY_ARRAYS}
+                    survey['columns'] = cached['columns'].tolist()
+                # Mark as recently used for prune_cache_dir()
+                os.utime(cache_path)
+                print(f"[Info] Using cached survey data: {cache_path}")
+                return survey
+            except Exception as e:
+                print(f"[Warning] Ignoring unreadable survey cache {cache_path}: {e}")
 
+    try:
+        data = pd.read_excel(file_path, sheet_name=0)
+        filtered_data = data[data['CHAIRPAD NO'].apply(lambda x: str(x).isnumeric())]
+    except Exception as e:
+        raise SurveyError("File Error", f"Could not read Excel file: {str(e)}")
 
-            max_length = max(len(position), len(measurement), len(data_measured), len(shell_run_out))
+    if filtered_data.empty:
+        raise SurveyError("Data Error", "No valid CHAIRPAD NO data found in the Excel file.")
 
-            pos = position[:max_length] + [np.nan] * (max_length - len(position))
-            meas = measurement[:max_length] + [np.nan] * (max_length - len(measurement))
-            data_measured_padded = list(data_measured) + [np.nan] * (max_length - len(data_measured))
-            shell_run_out_padded = shell_run_out + [np.nan] * (max_length - len(shell_run_out))
+    columns = [chr(65 + i) for i in range(len(filtered_data.columns))]
 
+    def metadata_row(row):
+        return pd.to_numeric(data.iloc[row, 1:], errors='coerce').to_numpy(dtype=float)
 
-            sheet_data = pd.DataFrame({
-                'Position': pos,
-                'Measurement': meas,
-                'Data Measured': data_measured_padded,
-                'Distortion': data_measured_padded,
-                'Run Out': shell_run_out_padded
-            })
+    try:
+        survey = {
+            'columns': columns[1:],
+            'measurements': filtered_data.iloc[:, 1:].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float),
+            'distance': metadata_row(68),
+            'cumulative_distance': metadata_row(69),
+            'min_temp': metadata_row(70),
+            'max_temp': metadata_row(71),
+            'avg_temp': metadata_row(72),
+        }
+    except IndexError:
+        raise SurveyError("Data Error", "Excel file does not have the required rows (68-72). Please check your file format.")
 
+    if cache_path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write then rename so parallel batch workers never see a partial file
+            temp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                np.savez(f, columns=np.array(survey['columns']), **{name: survey[name] for name in SURVEY_ARRAYS})
+            os.replace(temp_path, cache_path)
+            prune_cache_dir(cache_dir, SURVEY_CACHE_MAX_MB * 1024 * 1024, "survey cache")
+        except Exception as e:
+            print(f"[Warning] Could not write survey cache: {e}")
+
+    return survey
 
-            sheet_data['AA'] = sheet_data['Measurement'] / 180 * 3.14
-            sheet_data['AB'] = np.cos(sheet_data['AA']) * sheet_data['Run Out']
-            sheet_data['AC'] = np.sin(sheet_data['AA']) * sheet_data['Run Out']
 
 
-            SUM_AB = sheet_data['AB'][:-1].sum()
-            SUM_AC = sheet_data['AC'][:-1].sum()
+def pier_result(results, j):
+    """Per-pier sheet frame and summary values for column j of a compute_runout result"""
+    sheet_data = pd.DataFrame({
+        'Position': results['Position'],
+        'Measurement': results['Measurement'],
+        'Data Measured': results['Data Measured'][:, j],
+        'Distortion': results['AH'][:, j],
+        'Run Out': results['Run Out'][:, j],
+    })
+    for name in CURVE_COLUMNS:
+        sheet_data[name] = results[name][:, j]
 
+    summary = {name: results[name][j] for name in SUMMARY_RESULT_COLUMNS}
+    return {'sheet_data': sheet_data, 'summary': summary, 'harmonics': harmonic_summary(results, j)}
 
-            XX = 2 / int(user_inp) * SUM_AB
-            YY = 2 / int(user_inp) * SUM_AC
-            ZZ = np.sqrt(XX ** 2 + YY ** 2)
 
+def harmonic_column_names(k):
+    return f"H{k} Amplitude (mm)", f"H{k} Phase"
 
-            Angle_of_Occurrence = np.arccos(XX / ZZ) * 180 / 3.14 if ZZ != 0 else 0
-            if YY < 0:
-                Angle_of_Occurrence = 360 - Angle_of_Occurrence
 
+def harmonic_summary(results, j):
+    """Summary columns for the run-out harmonics of pier j: H1..Hn amplitude and phase"""
+    values = {}
+    for k in range(results['Harmonic Amplitude'].shape[0]):
+        amplitude_col, phase_col = harmonic_column_names(k + 1)
+        values[amplitude_col] = results['Harmonic Amplitude'][k, j]
+        values[phase_col] = results['Harmonic Phase'][k, j]
+    return values
 
-            sheet_data['AD'] = (Angle_of_Occurrence - sheet_data['Measurement']) / 180 * 3.14
-            sheet_data['AE'] = np.cos(sheet_data['AD'])
-            sheet_data['AF'] = ZZ * sheet_data['AE']
-            sheet_data['AG'] = sheet_data['Run Out'] - sheet_data['AF']
-            AVG_AG = sheet_data['AG'][:-1].mean()
-            sheet_data['AH'] = sheet_data['AG'] - AVG_AG
-            sheet_data['Distortion'] = sheet_data['AH']
-            sheet_data['AI'] = sheet_data['AF'] + AVG_AG
 
+# Bump when pier results or chart rendering change so old entries are not reused
+PIER_CACHE_VERSION = 4
 
-            summary_data.append({
-                'Position': i + 1,
-                'X': XX,
-                'Y': YY,
-                'Eccentricity (mm)': ZZ,
-                'Phase Angle': Angle_of_Occurrence,
-                'Runout': np.nanmax(shell_run_out),
-                'Local Shell Deformation': AVG_AG,
-                'Distance': distance_row[i] if i < len(distance_row) else np.nan,
-                'Cumulative Distance': cumulative_distance_row[i] if i < len(cumulative_distance_row) else np.nan,
-            })
+# Oldest (least recently used) entries are removed once the cache grows past this
+PIER_CACHE_MAX_MB = 512
 
-            Temp_data.append({
-                'Position': i + 1,
-                'Diff': Diff_temp[i] if i < len(Diff_temp) else np.nan,
-                'Min': Min_temp[i] if i < len(Min_temp) else np.nan,
-                'Max': Max_temp[i] if i < len(Max_temp) else np.nan,
-                'AVG': AVG_temp[i] if i < len(AVG_temp) else np.nan,
-            })
 
+PIER_CACHE_DIR = user_cache_dir("pier_cache")
 
-            all_sheet_data[f"Sheet_{i+1}"] = sheet_data
 
+class PierResultCache:
+    """
+    Per-pier results keyed by a fingerprint of the pier's measurement column
+    plus the settings that affect it (positions, radar positions, harmonics, fit mode, angles).
+    Entries hold the sheet frame, the summary values and rendered chart PNGs as
+    plain arrays in one .npz, read back without pickle. prune() keeps the cache
+    under max_mb by removing the least recently used entries.
+    """
+
+    def __init__(self, cache_dir, user_inp, radar_positions, harmonics=DEFAULT_HARMONICS, fit_mode="sum", angles=None,
+                 max_mb=PIER_CACHE_MAX_MB):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_mb * 1024 * 1024
+        angles_key = ",".join(repr(float(a)) for a in angles) if angles is not None else "uniform"
+        self.settings_key = (f"v{PIER_CACHE_VERSION}|{int(user_inp)}|{int(radar_positions)}|{int(harmonics)}"
+                             f"|{fit_mode}|{angles_key}")
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def fingerprint(self, column):
+        column = np.ascontiguousarray(column, dtype=np.float64)
+        digest = hashlib.sha256(f"{self.settings_key}|{len(column)}|".encode())
+        digest.update(column.tobytes())
+        return digest.hexdigest()
+
+    def _path(self, column):
+        return os.path.join(self.cache_dir, f"{self.fingerprint(column)}.npz")
+
+    def get(self, column):
+        path = self._path(column)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as cached:
+                columns = cached['columns'].tolist()
+                sheet_data = pd.DataFrame({name: cached[f"column_{k}"] for k, name in enumerate(columns)})
+                summary = dict(zip(cached['summary_keys'].tolist(), cached['summary_values']))
+                harmonics = dict(zip(cached['harmonic_keys'].tolist(), cached['harmonic_values']))
+                charts = {name: cached[f"chart_{name}"].tobytes() for name in cached['charts'].tolist()}
+            # Mark as recently used for prune()
+            os.utime(path)
         except Exception as e:
-            print(f"[Error] Processing column {col}: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            continue
+            print(f"[Warning] Ignoring unreadable pier cache entry {path}: {e}")
+            return None
+        return {'sheet_data': sheet_data, 'summary': summary, 'harmonics': harmonics, 'charts': charts}
 
+    def put(self, column, pier):
+        path = self._path(column)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            sheet_data = pier['sheet_data']
+            # Charts that could not be drawn are None and are left out
+            charts = {name: png for name, png in pier.get('charts', {}).items() if png is not None}
+            arrays = {
+                'columns': np.array(list(sheet_data.columns), dtype=str),
+                'summary_keys': np.array(list(pier['summary']), dtype=str),
+                'summary_values': np.array(list(pier['summary'].values()), dtype=float),
+                'harmonic_keys': np.array(list(pier['harmonics']), dtype=str),
+                'harmonic_values': np.array(list(pier['harmonics'].values()), dtype=float),
+                'charts': np.array(list(charts), dtype=str),
+            }
+            for k, name in enumerate(sheet_data.columns):
+                arrays[f"column_{k}"] = sheet_data[name].to_numpy()
+            for name, png in charts.items():
+                arrays[f"chart_{name}"] = np.frombuffer(png, dtype=np.uint8)
+            if any(values.dtype == object for values in arrays.values()):
+                raise TypeError("only numeric sheet columns can be cached")
+            with open(temp_path, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"[Warning] Could not write pier cache entry: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
 
-    if len(all_sheet_data) == 0:
-        messagebox.showerror("Processing Error", "No valid data could be processed. Please check your Excel file format.")
+    def prune(self):
+        """Remove the least recently used entries until the cache fits in max_mb"""
+        prune_cache_dir(self.cache_dir, self.max_bytes, "pier cache")
+
+
+def process_file(file_path, company_name, equipment_name, feed_rate, date_of_measurement, user_inp, no_of_pier, radar_positions,
+                 output_file="processed_data_with_summary.xlsx", pdf_path="processed_report.pdf", interactive=True,
+                 write_excel=True, chart_mode="raster", excel_mode="standard",
+                 columnar_store=None, columnar_format="arrow", cache_dir=None, pier_cache_dir=None,
+                 progress=None, cancel_event=None, trace=None, harmonics=DEFAULT_HARMONICS,
+                 fit_mode="sum", angles=None, backend="auto", report_workers=None, report_executor="process"):
+    """
+    Read, compute, write the workbook and build the PDF report for one survey.
+    Piers are fed through a ReportPipeline as they are built, so the workbook,
+    charts and report pages are produced alongside the pier loop.
+    progress: optional callback(message, done, total), called after every pier;
+              the compute pass counts as the first half of total, the report as the second
+    cancel_event: optional threading.Event, checked between piers; raises ProcessingCancelled
+    trace: optional RunTrace; every run's stage timings are appended to run_trace.jsonl next to the PDF
+    harmonics: run-out harmonics (FFT) added to the Summary sheet and the report, 0 to leave them out
+    fit_mode: "sum" (original cos/sin sums) or "lstsq" (least-squares fit over the valid readings)
+    angles: optional angle in degrees of each position, e.g. from an encoder (needs fit_mode="lstsq")
+    backend: runout engine, "auto" uses the numba kernel when it is installed (see runout_engine.BACKENDS)
+    report_workers: processes (or threads) rendering the report's raster charts, see generate_pdf_from_data
+    report_executor: "process" or "thread" chart workers (see CHART_EXECUTORS)
+    """
+    if excel_mode not in EXCEL_MODES:
+        raise ValueError(f"excel_mode must be one of {EXCEL_MODES}, got {excel_mode!r}")
+    if fit_mode not in FIT_MODES:
+        raise ValueError(f"fit_mode must be one of {FIT_MODES}, got {fit_mode!r}")
+    if chart_mode not in CHART_MODES:
+        raise ValueError(f"chart_mode must be one of {CHART_MODES}, got {chart_mode!r}")
+    if report_executor not in CHART_EXECUTORS:
+        raise ValueError(f"report_executor must be one of {CHART_EXECUTORS}, got {report_executor!r}")
+
+    if trace is None:
+        trace = RunTrace(os.path.basename(file_path))
+
+    try:
+        with trace_stage(trace, "read_survey"):
+            survey = read_survey(file_path, cache_dir=cache_dir)
+    except SurveyError as e:
+        show_error(e.title, e.message, interactive)
         return
 
+    distance_row = survey['distance']
+    cumulative_distance_row = survey['cumulative_distance']
+    Diff_temp = survey['min_temp'] - survey['max_temp']
+    Min_temp = survey['min_temp']
+    Max_temp = survey['max_temp']
+    AVG_temp = survey['avg_temp']
 
-    summary_df = pd.DataFrame(summary_data)
-    Temp_df = pd.DataFrame(Temp_data)
 
+    summary_data = []
+    Temp_data = []
+    all_sheet_data = {}
 
+
+    num_columns = len(survey['columns'])
+
+    if num_columns == 0:
+        show_error("Data Error", "No data columns found after filtering.", interactive)
+        return
+
+    # Piers whose column and settings are unchanged since the last run come from the cache
+    pier_cache = PierResultCache(pier_cache_dir, user_inp, radar_positions, harmonics, fit_mode, angles) if pier_cache_dir else None
+    cached_piers = {}
+    if pier_cache is not None:
+        with trace_stage(trace, "pier_cache"):
+            for i in range(num_columns):
+                entry = pier_cache.get(survey['measurements'][:, i])
+                if entry is not None:
+                    cached_piers[i] = entry
+
+    to_compute = [i for i in range(num_columns) if i not in cached_piers]
+    if cached_piers:
+        print(f"[Info] Reusing {len(cached_piers)} cached piers, recomputing {len(to_compute)}")
+    with trace_stage(trace, "compute"):
+        try:
+            results = compute_runout(survey['measurements'][:, to_compute], user_inp, harmonics,
+                                     fit_mode=fit_mode, angles=angles, backend=backend) if to_compute else None
+        except ValueError as e:
+            show_error("Settings Error", str(e), interactive)
+            return
+    result_index = {i: j for j, i in enumerate(to_compute)}
+
+    # Rendered chart PNGs per sheet, reused from the cache and filled in by the report
+    chart_images = {}
+    new_piers = {}
+
+    # Each finished pier goes straight on to the Excel, chart and PDF stages
+    excel_writer = None
+    if write_excel:
+        excel_writer = StreamingExcelWriter(output_file) if excel_mode == "streaming" else SheetExcelWriter(output_file)
+    report = ReportBuilder(company_name, equipment_name, feed_rate, date_of_measurement, no_of_pier,
+                           radar_positions, chart_mode)
+    pipeline = ReportPipeline(report, pdf_path, excel_writer, chart_images, num_columns,
+                              progress=progress, cancel_event=cancel_event, trace=trace,
+                              workers=report_workers, executor=report_executor)
+
+    # Errors are collected and shown once the pipeline and its chart workers have shut down
+    errors = []
+    finished = False
     try:
-        with pd.ExcelWriter(output_file, engine='openpyxl', mode='w') as writer:
-            for sheet_name, sheet_df in all_sheet_data.items():
-                sheet_df.to_excel(writer, sheet_name=sheet_name, index=False)
+        for i, col in enumerate(survey['columns']):
+            check_cancelled(cancel_event)
+            pipeline.step(f"Computing pier {i+1} of {num_columns}")
+            item = None
+            with trace_stage(trace, "pier", pier=i + 1):
+                try:
+                    if i in cached_piers:
+                        pier = cached_piers[i]
+                        chart_images[f"Sheet_{i+1}"] = dict(pier.get('charts', {}))
+                    else:
+                        j = result_index[i]
+                        if not results['valid'][j]:
+                            print(f"[Warning] Column {col} has no valid numeric data, skipping...")
+                            continue
+                        pier = pier_result(results, j)
+                        new_piers[i] = pier
+
+                    sheet_data = pier['sheet_data']
+
+                    summary_row = {
+                        'Position': i + 1,
+                        **pier['summary'],
+                        'Distance': distance_row[i] if i < len(distance_row) else np.nan,
+                        'Cumulative Distance': cumulative_distance_row[i] if i < len(cumulative_distance_row) else np.nan,
+                        **pier['harmonics'],
+                    }
+                    summary_data.append(summary_row)
+
+                    Temp_data.append({
+                        'Position': i + 1,
+                        'Diff': Diff_temp[i] if i < len(Diff_temp) else np.nan,
+                        'Min': Min_temp[i] if i < len(Min_temp) else np.nan,
+                        'Max': Max_temp[i] if i < len(Max_temp) else np.nan,
+                        'AVG': AVG_temp[i] if i < len(AVG_temp) else np.nan,
+                    })
+
+
+                    all_sheet_data[f"Sheet_{i+1}"] = sheet_data
+                    item = (f"Sheet_{i+1}", i + 1, sheet_data, summary_row)
 
-            Temp_df.to_excel(writer, sheet_name='Temp', index=False)
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
+                except Exception as e:
+                    print(f"[Error] Processing column {col}: {str(e)}")
+                    import traceback
+                    traceback.print_exc()
+                    continue
 
-        print(f"[Success] Excel file created: {output_file}")
+            # Blocks while the slowest stage is PIPELINE_DEPTH piers behind, traced as queue_wait
+            if item is not None:
+                pipeline.put(*item)
 
-    except Exception as e:
-        messagebox.showerror("Excel Error", f"Failed to create Excel file: {str(e)}")
+        if len(all_sheet_data) > 0:
+            summary_df = pd.DataFrame(summary_data)
+            Temp_df = pd.DataFrame(Temp_data)
+
+            if columnar_store:
+                try:
+                    with trace_stage(trace, "columnar_store"):
+                        write_columnar_store(columnar_store, all_sheet_data, summary_df, Temp_df, fmt=columnar_format)
+                    print(f"[Success] Columnar store created: {columnar_store}")
+                except Exception as e:
+                    errors.append(("Store Error", f"Failed to write columnar store: {str(e)}"))
+
+            # Waits for the last pages, the PDF save and the workbook's Temp / Summary sheets
+            finished = True
+            pipeline.finish(Temp_df, summary_df)
+    finally:
+        if not finished:
+            pipeline.abort()
+
+
+    if len(all_sheet_data) == 0:
+        show_error("Processing Error", "No valid data could be processed. Please check your Excel file format.", interactive)
         return
 
-    messagebox.showinfo("Success", f"File processed and saved as {output_file}")
+    if pipeline.report_error is not None:
+        errors.append(("PDF Error", f"Failed to generate PDF: {str(pipeline.report_error)}"))
+    else:
+        show_info("PDF Generated", f"PDF report saved as {pdf_path}", interactive)
+        if interactive:
+            open_pdf(pdf_path)
+
+    if pier_cache is not None:
+        # Store new piers, and cached ones that only now got their chart images
+        for i in range(num_columns):
+            sheet_name = f"Sheet_{i+1}"
+            pier = new_piers.get(i, cached_piers.get(i))
+            if pier is None:
+                continue
+            # A chart that could not be drawn (None, e.g. a radar with too few positions) is not kept
+            charts = {name: png for name, png in chart_images.get(sheet_name, {}).items() if png is not None}
+            if i in new_piers or charts != pier.get('charts', {}):
+                pier['charts'] = charts
+                pier_cache.put(survey['measurements'][:, i], pier)
+        pier_cache.prune()
+
+    trace_path = os.path.join(os.path.dirname(os.path.abspath(pdf_path)), TRACE_FILE)
+    trace.write_jsonl(trace_path, version=APP_VERSION, file=file_path, positions=int(user_inp), piers=num_columns,
+                      cached_piers=len(cached_piers), chart_mode=chart_mode,
+                      excel_mode=excel_mode if write_excel else None)
+
+    if write_excel:
+        if pipeline.excel_error is not None:
+            errors.append(("Excel Error", f"Failed to create Excel file: {str(pipeline.excel_error)}"))
+        else:
+            print(f"[Success] Excel file created: {output_file}")
+
+    if errors:
+        show_errors(errors, interactive)
+        return
 
-    try:
-        generate_pdf(
-            output_file,
-            "processed_report.pdf",
-            company_name,
-            equipment_name,
-            feed_rate,
-            date_of_measurement,
-            no_of_pier,
-            radar_positions
-        )
-    except Exception as e:
-        messagebox.showerror("PDF Error", f"Failed to generate PDF: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    if not write_excel:
+        show_info("Success", "File processed", interactive)
+        return
+
+    show_info("Success", f"File processed and saved as {output_file}", interactive)
 
 
+# Piers held in each queue between pipeline stages
+PIPELINE_DEPTH = 8
 
-# Function to create a radar chart - USER DEFINED POSITION LIMIT
-def create_radar_chart(ax, Run_out, title, max_positions):
+
+class ReportPipeline:
     """
-    Create radar chart showing only Run Out data with plain line
-    Shows only specified number of positions
-    Run_out: Actual runout data from Run Out column
-    max_positions: Maximum number of positions to display
+    Producer/consumer stages behind the pier loop of process_file.
+    Each finished pier is put on the Excel queue and the chart queue; the chart
+    stage renders its PNGs and hands the pier on to the PDF stage, which adds
+    its page. Every stage runs in its own thread behind a bounded queue, so the
+    workbook, charts and report are built while later piers are still coming,
+    and a slow stage holds the pier loop back instead of buffering the survey.
     """
-    try:
-        # Convert to list if pandas Series
-        if isinstance(Run_out, pd.Series):
-            Run_out = Run_out.tolist()
 
-        # Remove NaN values
-        Run_out = [x for x in Run_out if not pd.isna(x)]
+    def __init__(self, report, pdf_path, excel_writer, chart_images, total,
+                 progress=None, cancel_event=None, trace=None, workers=None, executor="process",
+                 depth=PIPELINE_DEPTH):
+        self.report = report
+        self.pdf_path = pdf_path
+        self.excel_writer = excel_writer
+        self.chart_images = chart_images
+        self.total = total
+        self.progress = progress
+        self.cancel_event = cancel_event
+        self.trace = trace
+        self.workers = workers if workers is not None and workers > 1 else None
+        self.executor = executor
+        self.produced = 0
+        self.pages = 0
+        self.excel_error = None
+        self.report_error = None
+        self.cancelled = False
+        # Output files already saved, removed again if the run turns out cancelled
+        self.saved = []
+        self.Temp_df = None
+        self.summary_df = None
+        self.fallback_charts = None
+        self.stage_failed = False
+        self.lock = threading.Lock()
+
+        # Room for every chart worker to be busy while the PDF stage waits on the oldest page
+        depth = max(depth, 2 * (self.workers or 0))
+        self.excel_queue = queue.Queue(maxsize=depth) if excel_writer is not None else None
+        self.chart_queue = queue.Queue(maxsize=depth)
+        self.page_queue = queue.Queue(maxsize=depth)
+
+        self.chart_thread = self._stage_thread(self._chart_stage, 'report_error')
+        self.page_thread = self._stage_thread(self._page_stage, 'report_error')
+        self.excel_thread = self._stage_thread(self._excel_stage, 'excel_error') if self.excel_queue is not None else None
+        self.threads = [thread for thread in (self.chart_thread, self.page_thread, self.excel_thread) if thread is not None]
+        for thread in self.threads:
+            thread.start()
+
+    def _stage_thread(self, stage, error_attr):
+        def run():
+            try:
+                stage()
+            except BaseException as e:
+                # A stage that dies is reported like its own errors, and stops the producer
+                import traceback
+                traceback.print_exc()
+                if getattr(self, error_attr) is None:
+                    setattr(self, error_attr, e)
+                self.stage_failed = True
+        return threading.Thread(target=run, daemon=True)
+
+    def _offer(self, target_queue, item, consumer):
+        """Put item on a stage's queue; gives up and returns False once that stage's thread has died"""
+        while consumer.is_alive():
+            try:
+                target_queue.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def step(self, message):
+        """Report the producer's progress, the pier loop counts as the first half of the total"""
+        self.produced += 1
+        self._report(message)
+
+    def put(self, sheet_name, pier, sheet_data, pier_summary):
+        """Hand a pier to the stages; raises ProcessingError if one of them has died"""
+        item = (sheet_name, pier, sheet_data, pier_summary)
+        targets = [(self.chart_queue, self.chart_thread)]
+        if self.excel_queue is not None:
+            targets.insert(0, (self.excel_queue, self.excel_thread))
+        with trace_stage(self.trace, "queue_wait", pier=pier):
+            for target_queue, consumer in targets:
+                if self.stage_failed or not self._offer(target_queue, item, consumer):
+                    error = self.report_error or self.excel_error
+                    raise ProcessingError(f"Report pipeline stopped: {error}")
+
+    def finish(self, Temp_df, summary_df):
+        """
+        Close the queues and wait for every stage.
+        Raises ProcessingCancelled if a stage saw the cancel, after removing any output already saved.
+        """
+        self.Temp_df = Temp_df
+        self.summary_df = summary_df
+        self._close()
+        if self.cancelled:
+            for path in self.saved:
+                if os.path.exists(path):
+                    os.remove(path)
+            raise ProcessingCancelled()
+
+    def abort(self):
+        """Stop after the pier loop failed or was cancelled: queued piers are dropped, nothing is saved"""
+        self.cancelled = True
+        self._close()
+
+    def _close(self):
+        if self.excel_queue is not None:
+            self._offer(self.excel_queue, None, self.excel_thread)
+        self._offer(self.chart_queue, None, self.chart_thread)
+        for thread in self.threads:
+            thread.join()
+
+    def _cancel_requested(self):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            self.cancelled = True
+        return self.cancelled
+
+    def _report(self, message):
+        if self.progress is not None:
+            with self.lock:
+                self.progress(message, self.produced - 1 + self.pages, 2 * self.total)
+
+    def _excel_stage(self):
+        writer = self.excel_writer
+        with trace_stage(self.trace, "excel_write"):
+            while True:
+                item = self.excel_queue.get()
+                if item is None:
+                    break
+                if writer is None or self._cancel_requested():
+                    continue
+                sheet_name, _, sheet_data, _ = item
+                try:
+                    writer.write_sheet(sheet_name, sheet_data)
+                except Exception as e:
+                    print(f"[Error] Writing sheet {sheet_name}: {str(e)}")
+                    self.excel_error = e
+                    writer = None
 
-        # Remove last duplicate point
-        Run_out = Run_out[:-1]
+            if writer is not None and not self._cancel_requested():
+                try:
+                    writer.close(self.Temp_df, self.summary_df)
+                    self.saved.append(writer.output_file)
+                except Exception as e:
+                    self.excel_error = e
 
+    def _chart_stage(self):
+        charts = None
+        executor = None
+        if self.report.chart_mode == "raster":
+            if self.workers is not None:
+                executor = chart_worker_pool(self.workers, self.executor)
+            if executor is None:
+                charts = ChartRenderer(self.report.radar_positions)
 
-        # Limit to user-specified number of positions
-        if len(Run_out) > max_positions:
-            Run_out = Run_out[:max_positions]
-            print(f"[Info] Limiting radar chart to first {max_positions} positions")
+        try:
+            while True:
+                item = self.chart_queue.get()
+                if item is None:
+                    break
+                pending = None
+                if not self.cancelled:
+                    sheet_name, pier, sheet_data, _ = item
+                    page_charts = self.chart_images.setdefault(sheet_name, {})
+                    if executor is not None:
+                        try:
+                            job = chart_job(sheet_name, sheet_data, page_charts)
+                            if job is not None:
+                                pending = executor.submit(render_chart_pages, self.report.radar_positions, [job])
+                        except Exception as e:
+                            # e.g. BrokenProcessPool after a worker died: the rest are drawn here
+                            print(f"[Warning] Chart workers failed at {sheet_name}, rendering charts serially: {e}")
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            executor = None
+                            charts = ChartRenderer(self.report.radar_positions)
+                    if executor is None and charts is not None:
+                        render_page_charts(charts, sheet_data, page_charts, pier, self.trace)
+                if not self._offer(self.page_queue, (item, pending), self.page_thread):
+                    break
+        finally:
+            self._offer(self.page_queue, None, self.page_thread)
+            if charts is not None:
+                charts.close()
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=self.cancelled)
+
+    def _page_stage(self):
+        with trace_stage(self.trace, "report"):
+            while True:
+                entry = self.page_queue.get()
+                if entry is None:
+                    break
+                if self._cancel_requested():
+                    continue
 
+                (sheet_name, pier, sheet_data, pier_summary), pending = entry
+                with trace_stage(self.trace, "pdf_page", pier=pier):
+                    try:
+                        page_charts = self.chart_images.setdefault(sheet_name, {})
+                        if pending is not None:
+                            self._collect_charts(sheet_name, pier, sheet_data, page_charts, pending)
+                        self.report.add_page(sheet_data, pier_summary, page_charts)
+                    except Exception as e:
+                        print(f"[Error] Sheet {sheet_name}:", e)
+                self.pages += 1
+                self._report(f"Building report page {self.pages} of {self.total}")
+
+            if self.fallback_charts is not None:
+                self.fallback_charts.close()
+            if self._cancel_requested() or self.pages == 0:
+                return
+            try:
+                self.report.save(self.pdf_path, self.trace)
+                self.saved.append(self.pdf_path)
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                self.report_error = e
 
-        # Flip data
-        Run_out_flipped = Run_out[1:] + Run_out[:1]
+    def _collect_charts(self, sheet_name, pier, sheet_data, page_charts, pending):
+        try:
+            for charts in pending.result().values():
+                page_charts.update(charts)
+        except Exception as e:
+            print(f"[Warning] Chart worker failed for {sheet_name}: {e}")
+        # Charts a worker could not render are drawn here, as the serial report would
+        if chart_job(sheet_name, sheet_data, page_charts) is not None:
+            if self.fallback_charts is None:
+                self.fallback_charts = ChartRenderer(self.report.radar_positions)
+            render_page_charts(self.fallback_charts, sheet_data, page_charts, pier, self.trace)
 
 
-        # Number of variables
-        num_vars = len(Run_out_flipped)
+class SheetExcelWriter:
+    """
+    The standard pandas/openpyxl workbook, written one sheet at a time.
+    Same interface as StreamingExcelWriter; openpyxl keeps the sheets in
+    memory and the file is only created by close(), so a cancelled run
+    leaves no empty workbook behind.
+    """
 
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.buffer = io.BytesIO()
+        self.writer = pd.ExcelWriter(self.buffer, engine='openpyxl')
 
-        if num_vars < 3:
-            print("[Warning] Need at least 3 data points for radar chart")
-            return
+    def write_sheet(self, sheet_name, df):
+        df.to_excel(self.writer, sheet_name=sheet_name, index=False)
 
+    def close(self, Temp_df, summary_df):
+        self.write_sheet('Temp', Temp_df)
+        self.write_sheet('Summary', summary_df)
+        self.writer.close()
+        with open(self.output_file, 'wb') as f:
+            f.write(self.buffer.getvalue())
 
-        # Create angles for the radar chart
-        angles = np.linspace(0, 2 * np.pi, num_vars, endpoint=False).tolist()
 
+class StreamingExcelWriter:
+    """
+    Write-only workbook for large surveys.
+    Each sheet is streamed row by row to openpyxl's temporary XML as it is written,
+    so no full cell object graph is kept in memory. Temp and Summary go last on close().
+    """
 
-        # Close the plot
-        Run_out_values = Run_out_flipped + [Run_out_flipped[0]]
-        angles_plot = angles + [angles[0]]
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.workbook = Workbook(write_only=True)
 
+    def write_sheet(self, sheet_name, df):
+        worksheet = self.workbook.create_sheet(title=sheet_name)
+        worksheet.append(list(df.columns))
 
-        # Draw radar chart
-        ax.set_theta_offset(np.pi / 2)
-        ax.set_theta_direction(-1)
+        # NaN is written as an empty cell, like DataFrame.to_excel does
+        values = df.astype(object).where(df.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            worksheet.append(row)
 
-        # Set position labels
-        position_labels = [f'{i+1}' for i in range(num_vars)]
-        plt.xticks(angles, position_labels, color='black', size=10, weight='bold')
+    def close(self, Temp_df, summary_df):
+        self.write_sheet('Temp', Temp_df)
+        self.write_sheet('Summary', summary_df)
+        self.workbook.save(self.output_file)
 
-        # Set proper y-axis limits based on data
-        y_min = min(Run_out_flipped) - 10
-        y_max = max(Run_out_flipped) + 10
-        ax.set_ylim(y_min, y_max)
 
-        # Add radial grid lines with labels
+
+def prepare_radar_data(Run_out, max_positions):
+    """
+    Shape Run Out data for the radar chart.
+    Returns (angles, closed angles, closed values, number of positions) or None
+    when there are fewer than 3 positions to draw.
+    """
+    # Convert to list if pandas Series
+    if isinstance(Run_out, pd.Series):
+        Run_out = Run_out.tolist()
+
+    # Remove NaN values
+    Run_out = [x for x in Run_out if not pd.isna(x)]
+
+    # Remove last duplicate point
+    Run_out = Run_out[:-1]
+
+
+    # Limit to user-specified number of positions
+    if len(Run_out) > max_positions:
+        Run_out = Run_out[:max_positions]
+        print(f"[Info] Limiting radar chart to first {max_positions} positions")
+
+
+    # Flip data
+    Run_out_flipped = Run_out[1:] + Run_out[:1]
+
+
+    # Number of variables
+    num_vars = len(Run_out_flipped)
+
+
+    if num_vars < 3:
+        print("[Warning] Need at least 3 data points for radar chart")
+        return None
+
+
+    # Create angles for the radar chart
+    angles = np.linspace(0, 2 * np.pi, num_vars, endpoint=False).tolist()
+
+
+    # Close the plot
+    Run_out_values = Run_out_flipped + [Run_out_flipped[0]]
+    angles_plot = angles + [angles[0]]
+
+    return angles, angles_plot, Run_out_values, num_vars
+
+
+class ChartRenderer:
+    """
+    Line graph and radar chart figures built once per report.
+    The static layer of each figure (title, labels, legend, grid) is drawn once
+    and cached; each pier only swaps the line data and y-limits, redraws the
+    y axis and lines on top of the cached layer and encodes the PNG.
+    Figures are attached to their own Agg canvas instead of pyplot, so no
+    global state is shared: renderers can work in any thread, one renderer
+    per thread (see worker_chart_renderer), as the cached layer is per figure.
+    """
+
+    RADAR_TITLE = "Roller Raceway eccentricity\n& deformation Polar Graph"
+    RADAR_FIGSIZE = (4.5, 4.5)
+
+    def __init__(self, radar_positions, dpi=150):
+        self.radar_positions = radar_positions
+        self.dpi = dpi
+        self.line_background = None
+        self.line_xlim = None
+        self.radar_background = None
+        self.radar_num_vars = None
+        self._build_line_figure()
+        self._build_radar_figure()
+
+    def _build_line_figure(self):
+        self.line_fig = Figure(figsize=(7, 3.5), dpi=self.dpi)
+        FigureCanvasAgg(self.line_fig)
+        ax = self.line_fig.add_subplot(111)
+        self.actual_line, = ax.plot([], [], label='Actual', linewidth=2)
+        self.reference_line, = ax.plot([], [], label='Reference', linewidth=2)
+        ax.set_xlabel("Position")
+        ax.set_ylabel("Value (mm)")
+        ax.set_title("Roller shaft deflection linear Graph\n(During single revolution of Kiln)")
+        self.line_legend = ax.legend()
+        ax.grid(True)
+        self.line_ax = ax
+
+        # Drawn per pier in the same order a full draw would use
+        self.line_dynamic = [ax.yaxis, self.actual_line, self.reference_line,
+                             *ax.spines.values(), self.line_legend]
+        for artist in self.line_dynamic:
+            artist.set_animated(True)
+
+    def _build_radar_figure(self):
+        self.radar_fig = Figure(figsize=self.RADAR_FIGSIZE, dpi=self.dpi)
+        FigureCanvasAgg(self.radar_fig)
+        ax = self.radar_fig.add_subplot(111, polar=True)
+        ax.set_theta_offset(np.pi / 2)
+        ax.set_theta_direction(-1)
+        self.radar_line, = ax.plot([], [], color='blue', linewidth=3, label='Run Out')
+        ax.set_title(self.RADAR_TITLE, size=14, y=1.1, weight='bold', pad=20)
+        ax.legend(loc='upper right', bbox_to_anchor=(1.2, 1.1), fontsize=11, frameon=True, shadow=True)
+        ax.grid(True, linestyle='--', alpha=0.7, linewidth=1)
+        self.radar_ax = ax
+        self.radar_position = ax.get_position()
+
+        # Radial grid circles sit at fixed fractions of the radius (ticks span the y-limits),
+        # so only the radial labels, the line and the outer circle change per pier
+        self.radar_dynamic = [ax.yaxis, self.radar_line, *ax.spines.values()]
+        for artist in self.radar_dynamic:
+            artist.set_animated(True)
+
+    def _fit_radar_layout(self):
+        # Crop the figure to its tight bounding box once, as savefig(bbox_inches='tight') would on every save
+        fig, ax = self.radar_fig, self.radar_ax
+        fig.set_size_inches(*self.RADAR_FIGSIZE)
+        ax.set_position(self.radar_position)
+
+        bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(matplotlib.rcParams['savefig.pad_inches'])
+        width, height = self.RADAR_FIGSIZE
+        pos = self.radar_position
+        fig.set_size_inches(bbox.width, bbox.height)
+        ax.set_position([
+            (pos.x0 * width - bbox.x0) / bbox.width,
+            (pos.y0 * height - bbox.y0) / bbox.height,
+            pos.width * width / bbox.width,
+            pos.height * height / bbox.height,
+        ])
+
+    def render_line_graph(self, run_out, reference):
+        """Draw Run Out against the AI reference curve, returns a PNG buffer"""
+        ax = self.line_ax
+        canvas = self.line_fig.canvas
+        self.actual_line.set_data(run_out.index, run_out.values)
+        self.reference_line.set_data(reference.index, reference.values)
+        ax.relim()
+        ax.autoscale_view()
+
+        # The cached layer holds the x axis, so rebuild it if the position range changes
+        if self.line_background is None or ax.get_xlim() != self.line_xlim:
+            canvas.draw()
+            self.line_background = canvas.copy_from_bbox(self.line_fig.bbox)
+            self.line_xlim = ax.get_xlim()
+        else:
+            canvas.restore_region(self.line_background)
+
+        for artist in self.line_dynamic:
+            ax.draw_artist(artist)
+        return canvas_to_png(canvas)
+
+    def render_radar_chart(self, run_out):
+        """Draw the Run Out polar graph, returns a PNG buffer or None if there is too little data"""
+        radar_data = prepare_radar_data(run_out, self.radar_positions)
+        if radar_data is None:
+            return None
+        angles, angles_plot, Run_out_values, num_vars = radar_data
+
+        ax = self.radar_ax
+        canvas = self.radar_fig.canvas
+
+        # Position labels, and with them the cached layer and crop, only change with the number of positions
+        if num_vars != self.radar_num_vars:
+            ax.set_xticks(angles)
+            ax.set_xticklabels([f'{i+1}' for i in range(num_vars)], color='black', size=10, weight='bold')
+            self._fit_radar_layout()
+            canvas.draw()
+            self.radar_background = canvas.copy_from_bbox(self.radar_fig.bbox)
+            self.radar_num_vars = num_vars
+        else:
+            canvas.restore_region(self.radar_background)
+
+        y_min = min(Run_out_values) - 10
+        y_max = max(Run_out_values) + 10
+        ax.set_ylim(y_min, y_max)
         y_ticks = np.linspace(y_min, y_max, 5)
         ax.set_yticks(y_ticks)
         ax.set_yticklabels([f'{y:.1f}' for y in y_ticks], size=8)
+        self.radar_line.set_data(angles_plot, Run_out_values)
 
-        # Plot ONLY plain line - NO fill, NO markers
-        ax.plot(angles_plot, Run_out_values, color='blue', linewidth=3, label='Run Out')
+        for artist in self.radar_dynamic:
+            ax.draw_artist(artist)
+        return canvas_to_png(canvas)
 
+    def close(self):
+        # Figures live on their own Agg canvases, not in pyplot, so dropping them is enough
+        self.line_fig = None
+        self.radar_fig = None
 
-        # Styling
-        ax.set_title(title, size=14, y=1.1, weight='bold', pad=20)
-        ax.legend(loc='upper right', bbox_to_anchor=(1.2, 1.1), fontsize=11, frameon=True, shadow=True)
 
-        # Add professional grid
-        ax.grid(True, linestyle='--', alpha=0.7, linewidth=1)
+def nice_ticks(low, high, max_ticks=6):
+    """Round tick values covering [low, high], used for the vector line graph axes"""
+    if not np.isfinite(low) or not np.isfinite(high):
+        low, high = 0.0, 1.0
+    if high <= low:
+        low, high = low - 0.5, high + 0.5
 
-        print(f"[Success] Radar chart created with {num_vars} positions")
+    raw_step = (high - low) / max_ticks
+    magnitude = 10 ** np.floor(np.log10(raw_step))
+    for multiple in (1, 2, 2.5, 5, 10):
+        step = multiple * magnitude
+        if (high - low) / step <= max_ticks:
+            break
 
-    except Exception as e:
-        print(f"[Error] Creating radar chart: {e}")
-        import traceback
-        traceback.print_exc()
+    start = np.floor(low / step) * step
+    stop = np.ceil(high / step) * step
+    return np.linspace(start, stop, int(round((stop - start) / step)) + 1)
 
-def generate_pdf(excel_path, pdf_path, company_name, equipment_name,
-                 feed_rate, date_of_measurement, no_of_pier, radar_positions):
 
-    import os, glob, webbrowser
-    import pandas as pd
-    import numpy as np
-    import matplotlib.pyplot as plt
-    from openpyxl import load_workbook
-    from fpdf import FPDF
-    from tkinter import messagebox
+def draw_line_graph_vector(pdf, run_out, reference, x, y, w, h):
+    """
+    Draw the Run Out / Reference line graph with FPDF vector primitives.
+    Same content as the raster graph, placed in the box (x, y, w, h) in mm.
+    """
+    series = [
+        (run_out, (31, 119, 180), 'Actual'),
+        (reference, (255, 127, 14), 'Reference'),
+    ]
+    xs = np.concatenate([np.asarray(s.index, dtype=float) for s, _, _ in series])
+    ys = np.concatenate([np.asarray(s.values, dtype=float) for s, _, _ in series])
+    if len(xs) == 0:
+        return
 
+    x_ticks = nice_ticks(xs.min(), xs.max(), max_ticks=8)
+    y_ticks = nice_ticks(ys.min(), ys.max())
+
+    left, right = x + 13, x + w - 3
+    top, bottom = y + 8, y + h - 9
+
+    def to_page(px, py):
+        page_x = left + (px - x_ticks[0]) / (x_ticks[-1] - x_ticks[0]) * (right - left)
+        page_y = bottom - (py - y_ticks[0]) / (y_ticks[-1] - y_ticks[0]) * (bottom - top)
+        return page_x, page_y
+
+    with pdf.local_context():
+        # Title
+        pdf.set_font("Arial", '', 7)
+        pdf.set_xy(x, y)
+        pdf.cell(w, 3, "Roller shaft deflection linear Graph", align='C')
+        pdf.set_xy(x, y + 3)
+        pdf.cell(w, 3, "(During single revolution of Kiln)", align='C')
+
+        # Grid and tick labels
+        pdf.set_font("Arial", '', 5)
+        pdf.set_draw_color(176, 176, 176)
+        pdf.set_line_width(0.1)
+        for tick in x_ticks:
+            page_x, _ = to_page(tick, y_ticks[0])
+            pdf.line(page_x, top, page_x, bottom)
+            pdf.set_xy(page_x - 5, bottom + 0.5)
+            pdf.cell(10, 2.5, f"{tick:g}", align='C')
+        for tick in y_ticks:
+            _, page_y = to_page(x_ticks[0], tick)
+            pdf.line(left, page_y, right, page_y)
+            pdf.set_xy(left - 9, page_y - 1.25)
+            pdf.cell(8.5, 2.5, f"{tick:g}", align='R')
+
+        # Frame
+        pdf.set_draw_color(0, 0, 0)
+        pdf.set_line_width(0.2)
+        pdf.rect(left, top, right - left, bottom - top)
+
+        # Data lines
+        pdf.set_line_width(0.4)
+        for values, color, _ in series:
+            points = [to_page(px, py) for px, py in zip(values.index, values.values)]
+            if len(points) > 1:
+                pdf.set_draw_color(*color)
+                pdf.polyline(points)
+
+        # Axis labels
+        pdf.set_font("Arial", '', 6)
+        pdf.set_xy(left, bottom + 3.5)
+        pdf.cell(right - left, 3, "Position", align='C')
+        with pdf.rotation(90, x + 2.5, (top + bottom) / 2):
+            pdf.text(x + 2.5 - 6, (top + bottom) / 2 + 1, "Value (mm)")
+
+        # Legend
+        legend_x, legend_y = right - 20, top + 1.5
+        pdf.set_draw_color(204, 204, 204)
+        pdf.set_fill_color(255, 255, 255)
+        pdf.set_line_width(0.1)
+        pdf.rect(legend_x, legend_y, 19, 7, style='DF')
+        pdf.set_font("Arial", '', 5)
+        for row, (_, color, label) in enumerate(series):
+            row_y = legend_y + 2 + row * 3
+            pdf.set_draw_color(*color)
+            pdf.set_line_width(0.4)
+            pdf.line(legend_x + 1.5, row_y, legend_x + 5.5, row_y)
+            pdf.set_xy(legend_x + 6.5, row_y - 1.25)
+            pdf.cell(12, 2.5, label)
+
+
+def draw_radar_chart_vector(pdf, run_out, max_positions, x, y, w):
+    """
+    Draw the Run Out polar graph with FPDF vector primitives.
+    Mirrors the raster radar chart: position 1 at the top, clockwise,
+    five radial grid rings spanning the data range +/- 10.
+    """
+    radar_data = prepare_radar_data(run_out, max_positions)
+    if radar_data is None:
+        return
+    angles, angles_plot, Run_out_values, num_vars = radar_data
+
+    y_min = min(Run_out_values) - 10
+    y_max = max(Run_out_values) + 10
+    y_ticks = np.linspace(y_min, y_max, 5)
+
+    radius = w * 0.36
+    cx = x + w / 2
+    cy = y + 13 + radius
+
+    def to_page(angle, value):
+        r = (value - y_min) / (y_max - y_min) * radius
+        return cx + r * np.sin(angle), cy - r * np.cos(angle)
+
+    with pdf.local_context():
+        # Title
+        pdf.set_font("Arial", 'B', 8)
+        pdf.set_xy(x, y)
+        pdf.cell(w, 3.5, "Roller Raceway eccentricity", align='C')
+        pdf.set_xy(x, y + 3.5)
+        pdf.cell(w, 3.5, "& deformation Polar Graph", align='C')
+
+        # Dashed polar grid: rings at the radial ticks and one spoke per position
+        pdf.set_draw_color(176, 176, 176)
+        pdf.set_line_width(0.15)
+        with pdf.local_context():
+            pdf.set_dash_pattern(dash=0.8, gap=0.6)
+            for tick in y_ticks[1:-1]:
+                r = (tick - y_min) / (y_max - y_min) * radius
+                pdf.ellipse(cx - r, cy - r, 2 * r, 2 * r)
+            for angle in angles:
+                pdf.line(cx, cy, *to_page(angle, y_max))
+
+        # Outer circle
+        pdf.set_draw_color(0, 0, 0)
+        pdf.set_line_width(0.25)
+        pdf.ellipse(cx - radius, cy - radius, 2 * radius, 2 * radius)
+
+        # Position labels around the rim
+        pdf.set_font("Arial", 'B', 6)
+        for i, angle in enumerate(angles):
+            label_x = cx + (radius + 3) * np.sin(angle)
+            label_y = cy - (radius + 3) * np.cos(angle)
+            pdf.set_xy(label_x - 3, label_y - 1.25)
+            pdf.cell(6, 2.5, f'{i+1}', align='C')
+
+        # Radial value labels along the 22.5 degree spoke
+        pdf.set_font("Arial", '', 4.5)
+        label_angle = np.deg2rad(22.5)
+        for tick in y_ticks:
+            label_x, label_y = to_page(label_angle, tick)
+            pdf.set_xy(label_x, label_y - 1)
+            pdf.cell(8, 2, f'{tick:.1f}')
+
+        # Run Out line
+        pdf.set_draw_color(0, 0, 255)
+        pdf.set_line_width(0.6)
+        pdf.polyline([to_page(angle, value) for angle, value in zip(angles_plot, Run_out_values)])
+
+        # Legend
+        legend_x, legend_y = x + w - 14, y + 7
+        pdf.set_draw_color(0, 0, 0)
+        pdf.set_fill_color(255, 255, 255)
+        pdf.set_line_width(0.1)
+        pdf.rect(legend_x, legend_y, 16, 4, style='DF')
+        pdf.set_draw_color(0, 0, 255)
+        pdf.set_line_width(0.6)
+        pdf.line(legend_x + 1, legend_y + 2, legend_x + 5, legend_y + 2)
+        pdf.set_font("Arial", '', 5.5)
+        pdf.set_xy(legend_x + 5.5, legend_y + 0.75)
+        pdf.cell(10, 2.5, 'Run Out')
+
+
+def generate_pdf(excel_path, pdf_path, company_name, equipment_name,
+                 feed_rate, date_of_measurement, no_of_pier, radar_positions, interactive=True,
+                 chart_mode="raster", trace=None, workers=None, chart_executor="process"):
+    """
+    Build the report from a processed workbook on disk.
+    All sheets are parsed in one pass and handed to generate_pdf_from_data.
+    """
     # ================= FILE CHECK =================
     if not os.path.exists(excel_path):
-        messagebox.showerror("Error", f"Excel file not found: {excel_path}")
+        show_error("Error", f"Excel file not found: {excel_path}", interactive)
         return
 
     try:
-        wb = load_workbook(excel_path, data_only=True)
-        sheet_names = wb.sheetnames
-        wb.close()
+        with trace_stage(trace, "read_workbook"):
+            sheets = pd.read_excel(excel_path, sheet_name=None)
     except Exception as e:
-        messagebox.showerror("Error", f"Could not read Excel file: {str(e)}")
+        show_error("Error", f"Could not read Excel file: {str(e)}", interactive)
         return
 
-    # ================= PDF CLASS =================
-    class PDF(FPDF):
-        def footer(self):
-            self.set_y(-15)
-            self.set_font('Arial', 'I', 10)
-            self.set_text_color(255, 0, 0)
-            self.cell(0, 10, 'Allan Smith Engineering Pvt. Ltd.', 0, 0, 'R')
+    all_sheet_data = {}
+    summary_df = None
+    Temp_df = None
+    for name, sheet_df in sheets.items():
+        if name.lower() == 'summary':
+            summary_df = sheet_df
+        elif name.lower() == 'temp':
+            Temp_df = sheet_df
+        else:
+            all_sheet_data[name] = sheet_df
+
+    generate_pdf_from_data(all_sheet_data, summary_df, Temp_df, pdf_path, company_name, equipment_name,
+                           feed_rate, date_of_measurement, no_of_pier, radar_positions, interactive=interactive,
+                           chart_mode=chart_mode, trace=trace, workers=workers, chart_executor=chart_executor)
+
+
+def generate_pdf_from_store(store_dir, pdf_path, company_name, equipment_name,
+                            feed_rate, date_of_measurement, no_of_pier, radar_positions, interactive=True,
+                            chart_mode="raster", workers=None, chart_executor="process"):
+    """Build the report from a columnar result store (see columnar_store.py) instead of the workbook"""
+    try:
+        all_sheet_data, summary_df, Temp_df = read_columnar_store(store_dir)
+    except Exception as e:
+        show_error("Error", f"Could not read columnar store: {str(e)}", interactive)
+        return
 
-    pdf = PDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
+    generate_pdf_from_data(all_sheet_data, summary_df, Temp_df, pdf_path, company_name, equipment_name,
+                           feed_rate, date_of_measurement, no_of_pier, radar_positions, interactive=interactive,
+                           chart_mode=chart_mode, workers=workers, chart_executor=chart_executor)
 
-    filtered_sheet_names = [
-        name for name in sheet_names if name.lower() not in ['summary', 'temp']
-    ]
+
+def generate_pdf_from_data(all_sheet_data, summary_df, Temp_df, pdf_path, company_name, equipment_name,
+                           feed_rate, date_of_measurement, no_of_pier, radar_positions, interactive=True,
+                           chart_mode="raster", chart_images=None, progress=None, cancel_event=None, trace=None,
+                           workers=None, chart_executor="process"):
+    """
+    Build the report straight from the frames computed by process_file.
+    all_sheet_data: {sheet name: per-pier DataFrame}
+    summary_df / Temp_df: Summary and Temp tables (Temp is not printed yet)
+    chart_mode: "raster" embeds matplotlib PNGs, "vector" draws the charts
+                with FPDF primitives (smaller, sharper PDF, no matplotlib)
+    chart_images: optional {sheet name: {'line': png bytes, 'radar': png bytes}};
+                  raster charts found here are embedded as-is, newly rendered
+                  ones are added so the caller can cache them
+    progress / cancel_event: as in process_file, reported and checked per page
+    trace: optional RunTrace, records each page, chart and the final pdf.output
+    workers: with more than one, raster charts are rendered in that many processes
+             first (see prerender_charts); pages are still assembled in pier order
+             from the same PNGs, so the PDF matches a serial run
+    chart_executor: "process" or "thread" workers (see CHART_EXECUTORS)
+    """
+    if chart_mode not in CHART_MODES:
+        raise ValueError(f"chart_mode must be one of {CHART_MODES}, got {chart_mode!r}")
+
+    filtered_sheet_names = list(all_sheet_data)
 
     if not filtered_sheet_names:
-        messagebox.showerror("Error", "No valid sheets found in Excel file")
+        show_error("Error", "No valid sheets found in Excel file", interactive)
         return
 
+    # Summary rows keyed by pier position, built once for the whole report
+    summary_lookup = build_summary_lookup(summary_df)
+
+    report = ReportBuilder(company_name, equipment_name, feed_rate, date_of_measurement, no_of_pier,
+                           radar_positions, chart_mode)
+
+    # Chart layouts are built once and reused for every pier
+    charts = ChartRenderer(radar_positions) if chart_mode == "raster" else None
+
+    if charts is not None and workers is not None and workers > 1:
+        if chart_images is None:
+            chart_images = {}
+        with trace_stage(trace, "chart_prerender"):
+            prerender_charts(all_sheet_data, chart_images, radar_positions, workers, cancel_event, chart_executor)
+
     # ================= MAIN LOOP =================
     for idx, sheet_name in enumerate(filtered_sheet_names):
+        check_cancelled(cancel_event)
+        if progress is not None:
+            progress(f"Building report page {idx+1} of {len(filtered_sheet_names)}", idx, len(filtered_sheet_names))
+        pier = sheet_position(sheet_name, idx)
+        with trace_stage(trace, "pdf_page", pier=pier):
+            try:
+                df = all_sheet_data[sheet_name]
+                page_charts = chart_images.setdefault(sheet_name, {}) if chart_images is not None else {}
+                if charts is not None:
+                    render_page_charts(charts, df, page_charts, pier, trace)
+                report.add_page(df, summary_lookup.get(pier, {}), page_charts)
+            except Exception as e:
+                print(f"[Error] Sheet {sheet_name}:", e)
+
+    if charts is not None:
+        charts.close()
+
+    # ================= SAVE PDF =================
+    report.save(pdf_path, trace)
+
+    show_info("PDF Generated", f"PDF report saved as {pdf_path}", interactive)
+
+    if not interactive:
+        return
+
+    open_pdf(pdf_path)
+
+
+def render_page_charts(charts, df, page_charts, pier=None, trace=None):
+    """Render the raster line graph and radar chart of one page into page_charts, unless already there"""
+    if 'Run Out' in df.columns and 'AI' in df.columns and page_charts.get('line') is None:
         try:
-            df = pd.read_excel(excel_path, sheet_name=sheet_name)
-            pdf.add_page()
+            with trace_stage(trace, "line_graph", pier=pier):
+                page_charts['line'] = charts.render_line_graph(df['Run Out'].dropna(), df['AI'].dropna()).getvalue()
+        except Exception as e:
+            print("[Graph Error]", e)
 
-            # ================= LOGO =================
-            if os.path.exists("companylogo.jpg"):
-                pdf.image("companylogo.jpg", x=10, y=20, w=25)
+    if 'Run Out' in df.columns and len(df['Run Out'].dropna()) > 2 and page_charts.get('radar') is None:
+        try:
+            with trace_stage(trace, "radar_chart", pier=pier):
+                radar_buffer = charts.render_radar_chart(df['Run Out'].dropna())
+            page_charts['radar'] = radar_buffer.getvalue() if radar_buffer is not None else None
+        except Exception as e:
+            print("[Radar Error]", e)
 
-            # ================= FIG IMAGE (EVERY PAGE) =================
-            if os.path.exists("FIG.jpg"):
-                pdf.image("FIG.jpg", x=110, y=240, w=100)
 
-            # ================= HEADER =================
-            pdf.set_font("Arial", 'B', 12)
-            pdf.cell(0, 10, "Roller shaft deflection Report", ln=True, align='C')
+class PageTemplate:
+    """
+    A static layer drawn once and stamped onto every page after that.
+    The first apply() draws it inside a local graphics state and keeps the
+    content stream it produced; later pages get those bytes appended as they
+    are, with the fonts and images they use registered on the page, instead
+    of laying out the same text and images again.
+    Stamping relies on fpdf2 internals (checked against 2.8); when they are
+    not there the layer is simply drawn on every page.
+    """
 
-            pdf.set_font("Arial", 'B', 11)
-            pdf.set_xy(40, 20); pdf.cell(0, 8, f"Company Name: {company_name}", ln=True)
-            pdf.set_xy(40, 25); pdf.cell(0, 8, f"Equipment Name: {equipment_name}", ln=True)
-            pdf.set_xy(40, 30); pdf.cell(0, 8, f"Capacity: {feed_rate}", ln=True)
-            pdf.set_xy(40, 35); pdf.cell(0, 8, f"Date of Measurement: {date_of_measurement}", ln=True)
-            pdf.set_xy(40, 40); pdf.cell(0, 8, "Method: Single Point", ln=True)
-            pdf.set_xy(40, 45); pdf.cell(0, 8, f"No. of Pier: {no_of_pier}", ln=True)
+    def __init__(self, draw):
+        self.draw = draw
+        self.stream = None
+        self.position = None
+
+    @staticmethod
+    def can_stamp(pdf):
+        page = pdf.pages.get(pdf.page) if isinstance(getattr(pdf, 'pages', None), dict) else None
+        return (isinstance(getattr(page, 'contents', None), bytearray)
+                and hasattr(pdf, '_out') and hasattr(pdf, 'current_font_is_set_on_page')
+                and hasattr(getattr(pdf, '_resource_catalog', None), 'index_stream_resources'))
+
+    def apply(self, pdf):
+        if not self.can_stamp(pdf):
+            self.draw(pdf)
+        elif self.stream is None:
+            contents = pdf.pages[pdf.page].contents
+            start = len(contents)
+            with pdf.local_context():
+                # Make sure the recording selects its own font instead of relying on the page's
+                pdf.current_font_is_set_on_page = False
+                self.draw(pdf)
+            self.position = (pdf.get_x(), pdf.get_y())
+            self.stream = bytes(contents[start:])
+        else:
+            pdf._out(self.stream)
+            pdf._resource_catalog.index_stream_resources(self.stream.decode('latin-1'), pdf.page)
+            pdf.set_xy(*self.position)
+
+
+def draw_report_footer(pdf):
+    pdf.set_y(-15)
+    pdf.set_font('Arial', 'I', 10)
+    pdf.set_text_color(255, 0, 0)
+    pdf.cell(0, 10, 'Allan Smith Engineering Pvt. Ltd.', 0, 0, 'R')
+
+
+class ReportPDF(FPDF):
+    def __init__(self):
+        super().__init__()
+        self.footer_template = PageTemplate(draw_report_footer)
+
+    def footer(self):
+        self.footer_template.apply(self)
+
+
+class ReportBuilder:
+    """
+    The report PDF, built one pier page at a time.
+    Raster charts come in as PNGs (see render_page_charts), so pages can be
+    added while the charts of later piers are still being rendered.
+    """
 
-            # ================= LINE GRAPH =================
-            if 'Run Out' in df.columns and 'AI' in df.columns:
-                try:
-                    plt.figure(figsize=(7, 3.5))
-                    plt.plot(df['Run Out'].dropna(), label='Actual', linewidth=2)
-                    plt.plot(df['AI'].dropna(), label='Reference', linewidth=2)
-                    plt.xlabel("Position")
-                    plt.ylabel("Value (mm)")
-                    plt.title("Roller shaft deflection linear Graph\n(During single revolution of Kiln)")
-                    plt.legend()
-                    plt.grid(True)
-
-                    graph_path = f"temp_graph_{sheet_name}.png"
-                    plt.savefig(graph_path, dpi=150)
-                    plt.close()
-
-                    if os.path.exists(graph_path):
-                        pdf.image(graph_path, x=110, y=180, w=100)
-                except Exception as e:
-                    print("[Graph Error]", e)
+    def __init__(self, company_name, equipment_name, feed_rate, date_of_measurement, no_of_pier,
+                 radar_positions, chart_mode="raster"):
+        self.company_name = company_name
+        self.equipment_name = equipment_name
+        self.feed_rate = feed_rate
+        self.date_of_measurement = date_of_measurement
+        self.no_of_pier = no_of_pier
+        self.radar_positions = radar_positions
+        self.chart_mode = chart_mode
+        self.pdf = ReportPDF()
+        self.pdf.set_auto_page_break(auto=True, margin=15)
+
+        # Logo, figure, title and metadata are the same on every pier page
+        self.page_template = PageTemplate(self.draw_static_layer)
+        self.below_table_image = "TUPDN.jpg" if os.path.exists("TUPDN.jpg") else None
+
+    def draw_static_layer(self, pdf):
+        # ================= LOGO =================
+        if os.path.exists("companylogo.jpg"):
+            pdf.image("companylogo.jpg", x=10, y=20, w=25)
+
+        # ================= FIG IMAGE (EVERY PAGE) =================
+        if os.path.exists("FIG.jpg"):
+            pdf.image("FIG.jpg", x=110, y=240, w=100)
+
+        # ================= HEADER =================
+        pdf.set_font("Arial", 'B', 12)
+        pdf.cell(0, 10, "Roller shaft deflection Report", ln=True, align='C')
+
+        pdf.set_font("Arial", 'B', 11)
+        pdf.set_xy(40, 20); pdf.cell(0, 8, f"Company Name: {self.company_name}", ln=True)
+        pdf.set_xy(40, 25); pdf.cell(0, 8, f"Equipment Name: {self.equipment_name}", ln=True)
+        pdf.set_xy(40, 30); pdf.cell(0, 8, f"Capacity: {self.feed_rate}", ln=True)
+        pdf.set_xy(40, 35); pdf.cell(0, 8, f"Date of Measurement: {self.date_of_measurement}", ln=True)
+        pdf.set_xy(40, 40); pdf.cell(0, 8, "Method: Single Point", ln=True)
+        pdf.set_xy(40, 45); pdf.cell(0, 8, f"No. of Pier: {self.no_of_pier}", ln=True)
+
+    def add_page(self, df, pier_summary, page_charts):
+        """
+        Draw one pier: static layer, line graph, results, radar chart, harmonics and position table.
+        pier_summary: the pier's Summary row as a dict
+        page_charts: {'line': png bytes, 'radar': png bytes}, not used for vector charts
+        """
+        pdf = self.pdf
+        pdf.add_page()
+        self.page_template.apply(pdf)
+
+        # ================= LINE GRAPH =================
+        if 'Run Out' in df.columns and 'AI' in df.columns:
             try:
-                summary_data = pd.read_excel(excel_path, sheet_name='Summary')
-                angle_of_occurrence_values = summary_data['Phase Angle'].dropna().tolist()
-                runout_values = summary_data['Runout'].dropna().tolist()
-                eccentricity_values = summary_data['Eccentricity (mm)'].dropna().tolist()
-
-                angle_of_occurrence_value = angle_of_occurrence_values[idx] if idx < len(angle_of_occurrence_values) else "N/A"
-                eccentricity_value = eccentricity_values[idx] if idx < len(eccentricity_values) else "N/A"
-                runout_value = runout_values[idx] if idx < len(runout_values) else "N/A"
+                if self.chart_mode == "vector":
+                    draw_line_graph_vector(pdf, df['Run Out'].dropna(), df['AI'].dropna(), x=110, y=180, w=100, h=50)
+                elif page_charts.get('line') is not None:
+                    pdf.image(io.BytesIO(page_charts['line']), x=110, y=180, w=100)
             except Exception as e:
-                print(f"[Warning] Could not read summary data: {e}")
-                angle_of_occurrence_value = "N/A"
-                eccentricity_value = "N/A"
-                runout_value = "N/A"
-
-            # Result metrics on RIGHT SIDE
-            pdf.set_font("Arial", style="B", size=13)
-            pdf.set_xy(140, 55)
-            pdf.cell(0, 10, f"Result:", align='R')
-            pdf.set_font("Arial", size=13)
-            pdf.set_xy(140, 62)
-            pdf.cell(0, 10, f"Run out Range = {runout_value:.2f} mm" if isinstance(runout_value, (int, float)) else f"Run out Range = {runout_value} mm", ln=True, align='R')
-            pdf.set_xy(140, 69)
-            pdf.cell(0, 10, f"Angle of Occurrence = {angle_of_occurrence_value:.2f}°" if isinstance(angle_of_occurrence_value, (int, float)) else f"Angle of Occurrence = {angle_of_occurrence_value}°", ln=True, align='R')
-            pdf.set_xy(140, 76)
-            pdf.cell(0, 10, f"Eccentricity = {eccentricity_value:.2f} mm" if isinstance(eccentricity_value, (int, float)) else f"Eccentricity = {eccentricity_value} mm", ln=True, align='R')
-
-            # ================= RADAR CHART =================
-            if 'Run Out' in df.columns and len(df['Run Out'].dropna()) > 2:
-                try:
-                    fig = plt.figure(figsize=(4.5, 4.5))
-                    ax = fig.add_subplot(111, polar=True)
-                    create_radar_chart(ax, df['Run Out'].dropna(),
-                                        "Roller Raceway eccentricity\n& deformation Polar Graph",
-                                        radar_positions)
-
-                    radar_path = f"temp_radar_{sheet_name}.png"
-                    plt.savefig(radar_path, dpi=150, bbox_inches='tight')
-                    plt.close()
-
-                    if os.path.exists(radar_path):
-                        pdf.image(radar_path, x=130, y=95, w=65)
-                except Exception as e:
-                    print("[Radar Error]", e)
-
-            # ================= TABLE =================
-            columns_to_print = [c for c in df.columns if c != 'Distortion'][:4]
-            pdf.set_xy(10, 60)
-
-            cell_width = 20
-            wide_width = 28
-            cell_h_data = 5
-            cell_h_header = 12
-            line_h = 4
-
-            header_texts = {
-                'Position': 'Position',
-                'Measurement': 'Measurement\nAngle',
-                'Data Measured': 'Data\nMeasured',
-                'Run Out': 'S.R.\nRun Out'
-            }
+                print("[Graph Error]", e)
+        angle_of_occurrence_value = summary_value(pier_summary, 'Phase Angle')
+        eccentricity_value = summary_value(pier_summary, 'Eccentricity (mm)')
+        runout_value = summary_value(pier_summary, 'Runout')
+
+        # Result metrics on RIGHT SIDE
+        pdf.set_font("Arial", style="B", size=13)
+        pdf.set_xy(140, 55)
+        pdf.cell(0, 10, f"Result:", align='R')
+        pdf.set_font("Arial", size=13)
+        pdf.set_xy(140, 62)
+        pdf.cell(0, 10, f"Run out Range = {runout_value:.2f} mm" if isinstance(runout_value, (int, float)) else f"Run out Range = {runout_value} mm", ln=True, align='R')
+        pdf.set_xy(140, 69)
+        pdf.cell(0, 10, f"Angle of Occurrence = {angle_of_occurrence_value:.2f}°" if isinstance(angle_of_occurrence_value, (int, float)) else f"Angle of Occurrence = {angle_of_occurrence_value}°", ln=True, align='R')
+        pdf.set_xy(140, 76)
+        pdf.cell(0, 10, f"Eccentricity = {eccentricity_value:.2f} mm" if isinstance(eccentricity_value, (int, float)) else f"Eccentricity = {eccentricity_value} mm", ln=True, align='R')
+
+        # ================= RADAR CHART =================
+        if 'Run Out' in df.columns and len(df['Run Out'].dropna()) > 2:
+            try:
+                if self.chart_mode == "vector":
+                    draw_radar_chart_vector(pdf, df['Run Out'].dropna(), self.radar_positions, x=130, y=95, w=65)
+                elif page_charts.get('radar') is not None:
+                    pdf.image(io.BytesIO(page_charts['radar']), x=130, y=95, w=65)
+            except Exception as e:
+                print("[Radar Error]", e)
+
+        # ================= HARMONICS =================
+        print_harmonics_table(pdf, pier_summary, x=125, y=165)
+
+        # ================= TABLE =================
+        columns_to_print = [c for c in df.columns if c != 'Distortion'][:4]
+        pdf.set_xy(10, 60)
+
+        cell_width = 20
+        wide_width = 28
+        cell_h_data = 5
+        cell_h_header = 12
+        line_h = 4
+
+        header_texts = {
+            'Position': 'Position',
+            'Measurement': 'Measurement\nAngle',
+            'Data Measured': 'Data\nMeasured',
+            'Run Out': 'S.R.\nRun Out'
+        }
+
+        def get_col_width(col):
+            return wide_width if col.lower() in ["measurement", "data measured"] else cell_width
+
+        def print_table_header():
+            pdf.set_font("Arial", 'B', 8)
+            for col in columns_to_print:
+                text = header_texts.get(col, col)
+                width = get_col_width(col)
+
+                x, y = pdf.get_x(), pdf.get_y()
+                lines = text.count("\n") + 1
+                y_offset = y + (cell_h_header - lines * line_h) / 2
+
+                pdf.rect(x, y, width, cell_h_header)
+                pdf.set_xy(x, y_offset)
+                pdf.multi_cell(width, line_h, text, border=0, align='C')
+                pdf.set_xy(x + width, y)
+            pdf.ln(cell_h_header)
+
+        print_table_header()
+        pdf.set_font("Arial", '', 8)
+
+        rows = list(zip(*format_table_columns(df, columns_to_print)))
+        widths = [get_col_width(col) for col in columns_to_print]
+        start = 0
+        while True:
+            # Rows go on until one starts below y = 270, so each page's share is known up front
+            fit = max(int((270 - pdf.get_y()) // cell_h_data) + 1, 0)
+            emit_table_rows(pdf, widths, cell_h_data, rows[start:start + fit])
+            start += fit
+            if start >= len(rows):
+                break
 
-            def get_col_width(col):
-                return wide_width if col.lower() in ["measurement", "data measured"] else cell_width
+            pdf.add_page()
+            pdf.set_xy(10, 20)
+            print_table_header()
+            pdf.set_font("Arial", '', 8)
 
-            def print_table_header():
-                pdf.set_font("Arial", 'B', 8)
-                for col in columns_to_print:
-                    text = header_texts.get(col, col)
-                    width = get_col_width(col)
+        # ================= IMAGE BELOW TABLE =================
+        if self.below_table_image is not None:
+            y = pdf.get_y()
+            if y > 220:
+                pdf.add_page()
+                y = 20
+            pdf.image(self.below_table_image, x=70, y=y + 5, w=70)
+            pdf.ln(60)
 
-                    x, y = pdf.get_x(), pdf.get_y()
-                    lines = text.count("\n") + 1
-                    y_offset = y + (cell_h_header - lines * line_h) / 2
+    def save(self, pdf_path, trace=None):
+        with trace_stage(trace, "pdf_output"):
+            self.pdf.output(pdf_path)
 
-                    pdf.rect(x, y, width, cell_h_header)
-                    pdf.set_xy(x, y_offset)
-                    pdf.multi_cell(width, line_h, text, border=0, align='C')
-                    pdf.set_xy(x + width, y)
-                pdf.ln(cell_h_header)
 
-            print_table_header()
-            pdf.set_font("Arial", '', 8)
 
-            for _, row in df.iterrows():
-                if pd.isna(row['Position']):
-                    continue
 
-                if pdf.get_y() > 270:
-                    pdf.add_page()
-                    pdf.set_xy(10, 20)
-                    
-                    print_table_header()
-                    pdf.set_font("Arial", '', 8)
-
-                for col in columns_to_print:
-                    width = get_col_width(col)
-                    val = row[col]
-
-                    if pd.isna(val):
-                        txt = "N/A"
-                    elif col.lower() == "position":
-                        txt = str(int(val))
-                    else:
-                        txt = f"{float(val):.2f}"
 
-                    pdf.cell(width, cell_h_data, txt, border=1, align='C')
-                pdf.ln(cell_h_data)
+def chart_job(sheet_name, df, page_charts):
+    """
+    Worker input for the raster charts a page still needs, or None if it has them all:
+    (sheet name, Run Out, AI or None to skip the line graph, draw radar)
+    """
+    if 'Run Out' not in df.columns:
+        return None
+    draw_line = 'AI' in df.columns and 'line' not in page_charts
+    draw_radar = 'radar' not in page_charts
+    if not (draw_line or draw_radar):
+        return None
+    return sheet_name, df['Run Out'].dropna(), df['AI'].dropna() if draw_line else None, draw_radar
+
+
+def chart_worker_pool(workers, executor="process"):
+    """Process or thread pool for chart rendering, or None (with a warning) if it cannot be started"""
+    if executor not in CHART_EXECUTORS:
+        raise ValueError(f"executor must be one of {CHART_EXECUTORS}, got {executor!r}")
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chart")
+    # Spawned, not forked: the numba engine may already have started worker threads in this process
+    try:
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    except Exception as e:
+        print(f"[Warning] Could not start chart workers, rendering serially: {e}")
+        return None
+
 
-            # ================= IMAGE BELOW TABLE =================
-            if os.path.exists("TUPDN.jpg"):
-                y = pdf.get_y()
-                if y > 220:
-                    pdf.add_page()
-                    y = 20
-                pdf.image("TUPDN.jpg", x=70, y=y + 5, w=70)
-                pdf.ln(60)
+# ChartRenderers of the current thread, by radar_positions
+_thread_charts = threading.local()
 
-        except Exception as e:
-            print(f"[Error] Sheet {sheet_name}:", e)
 
-    # ================= SAVE PDF =================
-    pdf.output(pdf_path)
+def worker_chart_renderer(radar_positions):
+    """The calling thread's ChartRenderer, kept for every page the thread (or worker process) renders"""
+    renderers = getattr(_thread_charts, 'renderers', None)
+    if renderers is None:
+        renderers = _thread_charts.renderers = {}
+    if radar_positions not in renderers:
+        renderers[radar_positions] = ChartRenderer(radar_positions)
+    return renderers[radar_positions]
+
 
-    # ================= CLEANUP =================
-    for f in glob.glob("temp_graph_*.png") + glob.glob("temp_radar_*.png"):
+def render_chart_pages(radar_positions, pages):
+    """
+    Raster charts for a run of report pages (runs in a chart worker process or thread).
+    pages: chart_job tuples
+    Returns {sheet name: {'line': png bytes, 'radar': png bytes or None}}
+    """
+    charts = worker_chart_renderer(radar_positions)
+    rendered = {}
+    for sheet_name, run_out, reference, draw_radar in pages:
+        page_charts = rendered.setdefault(sheet_name, {})
+        # A chart that fails here is left out and rendered (and reported) again by the page assembly
         try:
-            os.remove(f)
-        except:
-            pass
+            if reference is not None:
+                page_charts['line'] = charts.render_line_graph(run_out, reference).getvalue()
+            if draw_radar and len(run_out) > 2:
+                radar_buffer = charts.render_radar_chart(run_out)
+                page_charts['radar'] = radar_buffer.getvalue() if radar_buffer is not None else None
+        except Exception as e:
+            print(f"[Warning] Chart rendering for {sheet_name} failed in worker: {e}")
+    return rendered
 
-    messagebox.showinfo("PDF Generated", f"PDF report saved as {pdf_path}")
+
+def prerender_charts(all_sheet_data, chart_images, radar_positions, workers, cancel_event=None, executor="process"):
+    """
+    Render the raster charts missing from chart_images in worker processes or threads.
+    Pages are split into contiguous runs and the PNGs are added to
+    chart_images for generate_pdf_from_data to embed in pier order.
+    """
+    pages = [job for job in (chart_job(sheet_name, df, chart_images.get(sheet_name, {}))
+                             for sheet_name, df in all_sheet_data.items()) if job is not None]
+    if not pages:
+        return
+
+    # A few runs per worker keeps the processes busy when page costs differ
+    run_length = max(1, -(-len(pages) // (workers * 4)))
+    runs = [pages[start:start + run_length] for start in range(0, len(pages), run_length)]
+
+    pool = chart_worker_pool(min(workers, len(runs)), executor)
+    if pool is None:
+        return
 
     try:
-        os.startfile(pdf_path)
-    except:
-        webbrowser.open(pdf_path)
+        futures = [pool.submit(render_chart_pages, radar_positions, run) for run in runs]
+        for future in as_completed(futures):
+            check_cancelled(cancel_event)
+            for sheet_name, page_charts in future.result().items():
+                chart_images.setdefault(sheet_name, {}).update(page_charts)
+        unit = "processes" if executor == "process" else "threads"
+        print(f"[Info] Rendered charts for {len(pages)} pages in {min(workers, len(runs))} {unit}")
+    except ProcessingCancelled:
+        raise
+    except Exception as e:
+        # Charts that did not come back are rendered by the serial page loop
+        print(f"[Warning] Parallel chart rendering failed, finishing serially: {e}")
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def canvas_to_png(canvas):
+    """Encode the current pixels of an Agg canvas as an in-memory PNG"""
+    buffer = io.BytesIO()
+    Image.fromarray(np.asarray(canvas.buffer_rgba())).save(buffer, format='png', compress_level=1)
+    buffer.seek(0)
+    return buffer
+
+
+def build_summary_lookup(summary_df):
+    """Index the Summary table by pier position: {position: {column: value}}"""
+    if summary_df is None or 'Position' not in summary_df.columns:
+        print("[Warning] Could not read summary data: no Position column")
+        return {}
+
+    lookup = {}
+    for record in summary_df.to_dict('records'):
+        position = record.get('Position')
+        if pd.isna(position):
+            continue
+        lookup[int(position)] = record
+    return lookup
+
+
+def sheet_position(sheet_name, idx):
+    """Pier position of a Sheet_N page, falling back to page order for other names"""
+    prefix, _, number = sheet_name.rpartition('_')
+    if prefix == 'Sheet' and number.isdigit():
+        return int(number)
+    return idx + 1
+
+
+def print_harmonics_table(pdf, pier_summary, x, y):
+    """Run-out harmonic amplitude and phase of one pier, from the H<k> Summary columns"""
+    harmonics = []
+    k = 1
+    while harmonic_column_names(k)[0] in pier_summary:
+        amplitude_col, phase_col = harmonic_column_names(k)
+        harmonics.append((k, summary_value(pier_summary, amplitude_col), summary_value(pier_summary, phase_col)))
+        k += 1
+    if not harmonics:
+        return
 
+    label_width = 24
+    cell_width = min(14, 56 / len(harmonics))
+    cell_h = 4.5
 
+    def fmt(value, digits):
+        return f"{value:.{digits}f}" if isinstance(value, float) else value
+
+    rows = [
+        ("Harmonic", [f"H{k}" for k, _, _ in harmonics]),
+        ("Amplitude (mm)", [fmt(amplitude, 3) for _, amplitude, _ in harmonics]),
+        ("Phase (°)", [fmt(phase, 1) for _, _, phase in harmonics]),
+    ]
+    for row, (label, cells) in enumerate(rows):
+        pdf.set_xy(x, y + row * cell_h)
+        pdf.set_font("Arial", 'B', 8)
+        pdf.cell(label_width, cell_h, label, border=1, align='L')
+        pdf.set_font("Arial", 'B' if row == 0 else '', 8)
+        for text in cells:
+            pdf.cell(cell_width, cell_h, text, border=1, align='C')
+
+
+def format_table_columns(df, columns):
+    """
+    Position table text, one string array per column, formatted a column at a time.
+    Rows without a Position are left out, missing values read N/A.
+    """
+    df = df[df['Position'].notna()]
+    texts = []
+    for col in columns:
+        values = df[col].to_numpy(dtype=float)
+        missing = np.isnan(values)
+        if col.lower() == "position":
+            text = np.where(missing, 0, values).astype(np.int64).astype(str)
+        else:
+            text = np.char.mod('%.2f', values)
+        texts.append(np.where(missing, "N/A", text).tolist())
+    return texts
+
+
+def emit_table_rows(pdf, widths, height, rows):
+    """
+    Bordered, centred table rows from the current position, one tuple of cell texts per row.
+    For plain core-font text the rows are written as one block of the same operators
+    pdf.cell would produce; anything else falls back to pdf.cell. No page breaks here.
+    """
+    if not rows:
+        return
+
+    # The first row goes through pdf.cell, which also selects the font on the page
+    for text, width in zip(rows[0], widths):
+        pdf.cell(width, height, text, border=1, align='C')
+    pdf.ln(height)
+    rows = rows[1:]
+
+    # Private fpdf2 state (checked against 2.8) is read with getattr, so a release without it falls back
+    streamable = (isinstance(pdf.current_font, CoreFont) and hasattr(pdf, '_out')
+                  and getattr(pdf, 'current_font_is_set_on_page', False)
+                  and pdf.text_color == pdf.fill_color and pdf.text_mode == TextMode.FILL
+                  and pdf.char_vpos == CharVPos.LINE and pdf.char_spacing == 0 and pdf.font_stretching == 100
+                  and not (pdf.underline or getattr(pdf, 'strikethrough', True)
+                           or getattr(pdf, '_record_text_quad_points', True)))
+    if not streamable:
+        for row in rows:
+            for text, width in zip(row, widths):
+                pdf.cell(width, height, text, border=1, align='C')
+            pdf.ln(height)
+        return
+
+    k, page_h = pdf.k, pdf.h
+    x0, y = pdf.get_x(), pdf.get_y()
+    # Width and escaped string of each distinct cell text
+    cell_texts = {}
+    ops = []
+    for row in rows:
+        x = x0
+        top = (page_h - y) * k
+        bottom = (page_h - (y + height)) * k
+        baseline = (page_h - y - 0.5 * height - 0.3 * pdf.font_size) * k
+        for text, width in zip(row, widths):
+            cell_text = cell_texts.get(text)
+            if cell_text is None:
+                text_width = pdf.current_font.get_text_width(text, pdf.font_size_pt, None)[1] / k
+                # Backslashes and parentheses are escaped as pdf.cell does
+                cell_text = cell_texts[text] = (text_width, escape_parens(text))
+            text_width, escaped = cell_text
+            left, right = x * k, (x + width) * k
+            ops.append(f"{left:.2f} {top:.2f} {right - left:.2f} {bottom - top:.2f} re S "
+                       f"BT {(x + (width - text_width) / 2) * k:.2f} {baseline:.2f} Td ({escaped}) Tj ET")
+            x += width
+        y += height
+    pdf._out("\n".join(ops))
+    pdf.set_y(y)
+
+
+def summary_value(pier_summary, column):
+    value = pier_summary.get(column)
+    if value is None or pd.isna(value):
+        return "N/A"
+    return float(value)
 
 
 
@@ -549,11 +1850,140 @@ def on_submit():
 
 
     try:
-        process_file(file_path, company_name, equipment_name, feed_rate, date_of_measurement, int(positions), no_of_pier, radar_positions)
-    except Exception as e:
-        messagebox.showerror("Processing Error", f"Error: {str(e)}\n\nPlease check the console for details.")
-        import traceback
-        traceback.print_exc()
+        user_inp = int(positions)
+    except ValueError:
+        messagebox.showerror("Input Error", "No. of positions must be a valid number.")
+        return
+
+
+    global current_job
+    if current_job is not None:
+        messagebox.showwarning("Busy", "A file is already being processed.")
+        return
+
+    current_job = ProcessingJob(dict(
+        file_path=file_path, company_name=company_name, equipment_name=equipment_name, feed_rate=feed_rate,
+        date_of_measurement=date_of_measurement, user_inp=user_inp, no_of_pier=no_of_pier,
+        radar_positions=radar_positions, cache_dir=SURVEY_CACHE_DIR, pier_cache_dir=PIER_CACHE_DIR,
+    ))
+    submit_button.config(state=tk.DISABLED)
+    cancel_button.config(state=tk.NORMAL)
+    progress_bar['value'] = 0
+    status_label.config(text="Reading survey...")
+    current_job.start()
+    main_root.after(JOB_POLL_MS, poll_job)
+
+
+
+# ===== Background processing =====
+# The Tk widgets are only touched from the main thread; the worker posts
+# messages to a queue that poll_job drains every JOB_POLL_MS.
+JOB_POLL_MS = 100
+
+current_job = None
+
+
+class ProcessingJob:
+    """process_file on a worker thread, reporting through a thread-safe queue."""
+
+    def __init__(self, kwargs):
+        self.kwargs = kwargs
+        self.output_file = kwargs.get('output_file', "processed_data_with_summary.xlsx")
+        self.pdf_path = kwargs.get('pdf_path', "processed_report.pdf")
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.start_time = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.start_time = time.monotonic()
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def elapsed(self):
+        return time.monotonic() - self.start_time
+
+    def _progress(self, message, done, total):
+        self.messages.put(('progress', message, done, total))
+
+    def _run(self):
+        try:
+            process_file(**self.kwargs, interactive=False, progress=self._progress, cancel_event=self.cancel_event)
+            self.messages.put(('done', None))
+        except ProcessingCancelled:
+            self.messages.put(('cancelled', None))
+        except ProcessingError as e:
+            self.messages.put(('error', str(e)))
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            self.messages.put(('error', f"Error: {str(e)}\n\nPlease check the console for details."))
+
+
+def format_eta(elapsed, done, total):
+    """Remaining time from the average time per step so far"""
+    if done <= 0:
+        return "estimating..."
+    remaining = int(round(elapsed * (total - done) / done))
+    minutes, seconds = divmod(remaining, 60)
+    return f"{minutes}:{seconds:02d} remaining"
+
+
+def poll_job():
+    job = current_job
+    if job is None:
+        return
+
+    try:
+        while True:
+            message = job.messages.get_nowait()
+            if message[0] == 'progress':
+                _, text, done, total = message
+                progress_bar['maximum'] = total
+                progress_bar['value'] = done
+                status_label.config(text=f"{text}  ({format_eta(job.elapsed(), done, total)})")
+            else:
+                finish_job(job, *message)
+                return
+    except queue.Empty:
+        pass
+
+    main_root.after(JOB_POLL_MS, poll_job)
+
+
+def finish_job(job, outcome, error_message):
+    global current_job
+    current_job = None
+    submit_button.config(state=tk.NORMAL)
+    cancel_button.config(state=tk.DISABLED)
+
+    if outcome == 'done':
+        progress_bar['value'] = progress_bar['maximum']
+        status_label.config(text=f"Finished in {job.elapsed():.1f}s")
+        messagebox.showinfo("Success", f"File processed and saved as {job.output_file}\nPDF report saved as {job.pdf_path}")
+        open_pdf(job.pdf_path)
+    elif outcome == 'cancelled':
+        progress_bar['value'] = 0
+        status_label.config(text="Cancelled")
+    else:
+        progress_bar['value'] = 0
+        status_label.config(text="Failed")
+        messagebox.showerror("Processing Error", error_message)
+
+
+def on_cancel():
+    if current_job is not None:
+        current_job.cancel()
+        cancel_button.config(state=tk.DISABLED)
+        status_label.config(text="Cancelling after the current pier...")
+
+
+def on_close():
+    if current_job is not None:
+        current_job.cancel()
+    main_root.destroy()
 
 
 
@@ -564,7 +1994,7 @@ def show_about():
 
 
     tk.Label(about_window, text="Roller shaft deflection Report Generator", font=('Arial', 12, 'bold')).pack(pady=10)
-    tk.Label(about_window, text="Version 1.0", font=('Arial', 10)).pack()
+    tk.Label(about_window, text=f"Version {APP_VERSION}", font=('Arial', 10)).pack()
     tk.Label(about_window, text="Developed by Shiv Sunil Kasat", font=('Arial', 12, 'bold')).pack(pady=10)
 
 
@@ -582,15 +2012,46 @@ def show_about():
 
 
 
+def show_run_trace():
+    """Stage timing summary of the most recent run, read from run_trace.jsonl next to the outputs"""
+    if not os.path.exists(TRACE_FILE):
+        messagebox.showinfo("Run Timings", "No runs recorded yet. Process a file first.")
+        return
+
+    try:
+        records = load_records(TRACE_FILE, last=1)
+    except Exception as e:
+        messagebox.showerror("Run Timings", f"Could not read {TRACE_FILE}: {str(e)}")
+        return
+    if not records:
+        messagebox.showinfo("Run Timings", "No runs recorded yet. Process a file first.")
+        return
+
+    trace_window = tk.Toplevel()
+    trace_window.title("Last Run Timings")
+    trace_window.geometry("560x420")
+
+    text = tk.Text(trace_window, font=('Courier', 9), wrap='none')
+    text.insert('1.0', format_summary(records[-1]))
+    text.config(state=tk.DISABLED)
+    text.pack(fill='both', expand=True, padx=10, pady=10)
+
+
+
 def show_main_app():
     login_window.destroy()
     global entry_company, entry_equipment, entry_feed, entry_date, entry_positions, entry_pier, entry_file, entry_radar_positions
+    global main_root, submit_button, cancel_button, progress_bar, status_label
     root = tk.Tk()
+    main_root = root
     root.title("Axial Runout Report Generator - Single Point")
-    root.geometry("600x500")
+    root.geometry("600x580")
     root.resizable(False, False)
 
     menu_bar = tk.Menu(root)
+    view_menu = tk.Menu(menu_bar, tearoff=0)
+    view_menu.add_command(label="Last Run Timings", command=show_run_trace)
+    menu_bar.add_cascade(label="View", menu=view_menu)
     help_menu = tk.Menu(menu_bar, tearoff=0)
     help_menu.add_command(label="About Developer", command=show_about)
     menu_bar.add_cascade(label="Help", menu=help_menu)
@@ -642,9 +2103,21 @@ def show_main_app():
     tk.Label(root, text="(number of positions to show on radar chart)", font=('Arial', 8), fg='gray').grid(row=9, column=1, sticky='w', padx=5)
 
 
-    tk.Button(root, text="Process File", bg="#27ae60", fg="white", command=on_submit, height=2, width=20, font=('Arial', 12, 'bold')).grid(row=10, column=0, columnspan=3, pady=30)
+    button_frame = tk.Frame(root)
+    button_frame.grid(row=10, column=0, columnspan=3, pady=(25, 10))
+    submit_button = tk.Button(button_frame, text="Process File", bg="#27ae60", fg="white", command=on_submit, height=2, width=20, font=('Arial', 12, 'bold'))
+    submit_button.pack(side='left', padx=10)
+    cancel_button = tk.Button(button_frame, text="Cancel", bg="#c0392b", fg="white", command=on_cancel, height=2, width=10, font=('Arial', 12, 'bold'), state=tk.DISABLED)
+    cancel_button.pack(side='left', padx=10)
+
+
+    progress_bar = ttk.Progressbar(root, orient='horizontal', length=540, mode='determinate')
+    progress_bar.grid(row=11, column=0, columnspan=3, padx=20, pady=(5, 2))
+    status_label = tk.Label(root, text="", font=('Arial', 9), fg='gray')
+    status_label.grid(row=12, column=0, columnspan=3)
 
 
+    root.protocol("WM_DELETE_WINDOW", on_close)
     root.mainloop()
 
 
@@ -663,39 +2136,40 @@ def check_login():
 
 
 
-# Main login window
-login_window = tk.Tk()
-login_window.title("Login - Axial Runout Report Generator")
-login_window.geometry("350x220")
-login_window.resizable(False, False)
+if __name__ == "__main__":
+    # Main login window
+    login_window = tk.Tk()
+    login_window.title("Login - Axial Runout Report Generator")
+    login_window.geometry("350x220")
+    login_window.resizable(False, False)
 
 
-window_width = 350
-window_height = 220
-screen_width = login_window.winfo_screenwidth()
-screen_height = login_window.winfo_screenheight()
-center_x = int(screen_width/2 - window_width/2)
-center_y = int(screen_height/2 - window_height/2)
-login_window.geometry(f'{window_width}x{window_height}+{center_x}+{center_y}')
+    window_width = 350
+    window_height = 220
+    screen_width = login_window.winfo_screenwidth()
+    screen_height = login_window.winfo_screenheight()
+    center_x = int(screen_width/2 - window_width/2)
+    center_y = int(screen_height/2 - window_height/2)
+    login_window.geometry(f'{window_width}x{window_height}+{center_x}+{center_y}')
 
 
-tk.Label(login_window, text="Login", font=('Arial', 16, 'bold')).pack(pady=15)
+    tk.Label(login_window, text="Login", font=('Arial', 16, 'bold')).pack(pady=15)
 
 
-tk.Label(login_window, text="Username:", font=('Arial', 11)).pack(pady=5)
-user_entry = tk.Entry(login_window, width=30, font=('Arial', 10))
-user_entry.pack()
+    tk.Label(login_window, text="Username:", font=('Arial', 11)).pack(pady=5)
+    user_entry = tk.Entry(login_window, width=30, font=('Arial', 10))
+    user_entry.pack()
 
 
-tk.Label(login_window, text="Password:", font=('Arial', 11)).pack(pady=5)
-pass_entry = tk.Entry(login_window, show="*", width=30, font=('Arial', 10))
-pass_entry.pack()
+    tk.Label(login_window, text="Password:", font=('Arial', 11)).pack(pady=5)
+    pass_entry = tk.Entry(login_window, show="*", width=30, font=('Arial', 10))
+    pass_entry.pack()
 
 
-pass_entry.bind('<Return>', lambda event: check_login())
+    pass_entry.bind('<Return>', lambda event: check_login())
 
 
-tk.Button(login_window, text="Login", command=check_login, bg="#3498db", fg="white", width=15, height=1, font=('Arial', 11, 'bold')).pack(pady=20)
+    tk.Button(login_window, text="Login", command=check_login, bg="#3498db", fg="white", width=15, height=1, font=('Arial', 11, 'bold')).pack(pady=20)
 
 
-login_window.mainloop()
\ No newline at end of file
+    login_window.mainloop()
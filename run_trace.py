@@ -0,0 +1,191 @@
+"""
+Per-stage timing and resource trace for report runs.
+
+process_file records every stage (survey read, compute, per-pier frames,
+Excel write, chart rendering, PDF pages, pdf.output) in a RunTrace and
+appends one JSON line per run to run_trace.jsonl next to the outputs.
+
+Usage:
+    python run_trace.py reports/run_trace.jsonl            # last run
+    python run_trace.py reports/run_trace.jsonl --last 5   # last five runs
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+TRACE_FILE = "run_trace.jsonl"
+
+
+def current_rss_mb():
+    """Resident set size of this process right now in MB, or None if it cannot be measured"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    return None
+
+
+def cpu_seconds():
+    """
+    CPU time of this process (all threads, numba's included) plus its finished child
+    processes, such as chart workers that have been shut down
+    """
+    cpu = time.process_time()
+    if resource is not None:
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu += children.ru_utime + children.ru_stime
+    return cpu
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (over its whole lifetime), or None if it cannot be measured"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        # Windows keeps the peak working set, elsewhere only the current RSS is available
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    return None
+
+
+class RunTrace:
+    """
+    Wall time, CPU time and memory per stage of one run.
+    CPU time is process-wide (every thread plus finished child processes), so
+    stages that overlap, like the Excel write and the report pages, each
+    include the other's CPU. Memory is the RSS at the end of the stage and
+    its change over the stage; the lifetime peak is only kept for the run.
+    """
+
+    def __init__(self, label=""):
+        self.label = label
+        self.stages = []
+        self.start_wall = time.perf_counter()
+        self.start_cpu = cpu_seconds()
+
+    @contextmanager
+    def stage(self, name, pier=None):
+        wall = time.perf_counter()
+        cpu = cpu_seconds()
+        rss = current_rss_mb()
+        try:
+            yield
+        finally:
+            rss_end = current_rss_mb()
+            self.stages.append({
+                'stage': name,
+                'pier': pier,
+                'wall_s': time.perf_counter() - wall,
+                'cpu_s': cpu_seconds() - cpu,
+                'rss_mb': rss_end,
+                'rss_delta_mb': rss_end - rss if rss is not None and rss_end is not None else None,
+            })
+
+    def summary(self):
+        """Stages aggregated by name in first-seen order: count, wall, CPU, largest end RSS, net RSS change"""
+        rows = {}
+        for record in list(self.stages):
+            row = rows.setdefault(record['stage'], {'stage': record['stage'], 'count': 0, 'wall_s': 0.0,
+                                                    'cpu_s': 0.0, 'rss_mb': None, 'rss_delta_mb': None})
+            row['count'] += 1
+            row['wall_s'] += record['wall_s']
+            row['cpu_s'] += record['cpu_s']
+            if record['rss_mb'] is not None:
+                row['rss_mb'] = max(row['rss_mb'] or 0.0, record['rss_mb'])
+            if record['rss_delta_mb'] is not None:
+                row['rss_delta_mb'] = (row['rss_delta_mb'] or 0.0) + record['rss_delta_mb']
+        return list(rows.values())
+
+    def record(self, **meta):
+        """The JSON-lines record for this run; meta holds the run settings"""
+        return {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'label': self.label,
+            **meta,
+            'total_wall_s': time.perf_counter() - self.start_wall,
+            'total_cpu_s': cpu_seconds() - self.start_cpu,
+            'peak_rss_mb': peak_rss_mb(),
+            'summary': self.summary(),
+            'stages': list(self.stages),
+        }
+
+    def write_jsonl(self, path, **meta):
+        record = self.record(**meta)
+        try:
+            # One short append per run, so parallel batch workers can share a file
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, default=float) + "\n")
+        except Exception as e:
+            print(f"[Warning] Could not write run trace: {e}")
+        return record
+
+
+def trace_stage(trace, name, pier=None):
+    """trace.stage(...), or a no-op context when no trace is passed"""
+    return trace.stage(name, pier) if trace is not None else nullcontext()
+
+
+def format_summary(record):
+    """Summary table of one JSON-lines record, as printed by the CLI and shown in the GUI"""
+    def mb(value, sign=""):
+        return f"{value:{sign}.1f}" if value is not None else "n/a"
+
+    lines = [
+        f"Run {record.get('label', '')}  {record.get('timestamp', '')}",
+        f"Total: {record['total_wall_s']:.2f}s wall, {record['total_cpu_s']:.2f}s CPU, "
+        f"peak RSS {mb(record.get('peak_rss_mb'))} MB",
+        "",
+        f"{'Stage':<16}{'Count':>7}{'Wall (s)':>11}{'CPU (s)':>11}{'RSS (MB)':>11}{'RSS +/- (MB)':>14}",
+        "-" * 70,
+    ]
+    for row in record['summary']:
+        # Records written before rss_mb existed only have the lifetime peak
+        lines.append(f"{row['stage']:<16}{row['count']:>7}{row['wall_s']:>11.3f}{row['cpu_s']:>11.3f}"
+                     f"{mb(row.get('rss_mb', row.get('peak_rss_mb'))):>11}{mb(row.get('rss_delta_mb'), '+'):>14}")
+    return "\n".join(lines)
+
+
+def load_records(path, last=1):
+    with open(path, 'r', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return records[-last:] if last else records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the stage timing summary of recorded report runs.")
+    parser.add_argument("trace_file", nargs="?", default=TRACE_FILE, help="run_trace.jsonl written next to the outputs")
+    parser.add_argument("--last", type=int, default=1, help="Number of most recent runs to show (0 for all)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.trace_file):
+        print(f"[Error] Trace file not found: {args.trace_file}")
+        return 1
+
+    for record in load_records(args.trace_file, args.last):
+        print(format_summary(record))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+from functools import lru_cache
+
+import numpy as np
+
+from runout_kernels import NUMBA_AVAILABLE, fused_curves
+
+
+# Curve columns produced per pier, in the order process_file writes them
+CURVE_COLUMNS = ['AA', 'AB', 'AC', 'AD', 'AE', 'AF', 'AG', 'AH', 'AI']
+
+# Harmonics reported per pier: 1 is the eccentricity, 2 the ovality, higher orders shell deformation
+DEFAULT_HARMONICS = 4
+
+# Eccentricity from the fixed cos/sin sums over all positions, or a least-squares
+# fit over the valid readings only (needed for missing readings or non-uniform angles)
+FIT_MODES = ("sum", "lstsq")
+
+# "auto" uses the compiled kernel when numba is installed and the fit mode allows it
+BACKENDS = ("auto", "numpy", "numba")
+
+
+class AngleBasis:
+    """
+    Angle grid of one position count: Position and Measurement (degrees, with
+    the closing 360 row), exact angles in radians and their cos/sin basis.
+    Built once per position count and shared by every pier and file.
+    measurement: optional angle of each position in degrees (e.g. from an
+                 encoder), evenly spaced when left out
+    """
+
+    def __init__(self, positions, measurement=None):
+        self.positions = positions
+        self.uniform = measurement is None
+        if measurement is None:
+            angle_increment = 360 / positions
+            measurement = [i * angle_increment for i in range(positions)]
+        measurement = [float(a) for a in measurement]
+        if len(measurement) != positions:
+            raise ValueError(f"Expected {positions} position angles, got {len(measurement)}")
+        self.position = np.array(list(range(1, positions + 1)) + [1], dtype=float)
+        self.measurement = np.array(measurement + [measurement[0] + 360], dtype=float)
+        self.radians = np.deg2rad(self.measurement)
+        self.cos = np.cos(self.radians)
+        self.sin = np.sin(self.radians)
+        for values in (self.position, self.measurement, self.radians, self.cos, self.sin):
+            values.flags.writeable = False
+
+
+@lru_cache(maxsize=None)
+def angle_basis(positions):
+    """Shared AngleBasis for a position count, built on first use"""
+    return AngleBasis(int(positions))
+
+
+def compute_runout(measurements, user_inp, harmonics=DEFAULT_HARMONICS, fit_mode="sum", angles=None,
+                   backend="auto"):
+    """
+    Batched runout engine for a whole survey.
+    measurements: (positions x piers) matrix of raw readings, NaN for missing
+    user_inp: number of positions per revolution entered by the user
+    harmonics: number of run-out harmonics in 'Harmonic Amplitude' / 'Harmonic Phase'
+               (evenly spaced angles only, NaN otherwise; with fit_mode="lstsq" also
+               NaN for piers with missing readings)
+    fit_mode: "sum" (2/n cos/sin sums, missing readings count as 0) or "lstsq"
+              (least-squares fit over the valid readings of each pier)
+    angles: optional angle of each of the user_inp positions in degrees; needs fit_mode="lstsq"
+    backend: "numpy", "numba" (fused compiled kernel, fit_mode="sum" only) or "auto";
+             falls back to NumPy when numba is not installed
+    Returns a dict of per-position curves (rows x piers) and per-pier results,
+    matching the per-column calculation process_file used to do one pier at a time.
+    """
+    data = np.asarray(measurements, dtype=float)
+    if data.ndim == 1:
+        data = data[:, None]
+
+    if fit_mode not in FIT_MODES:
+        raise ValueError(f"fit_mode must be one of {FIT_MODES}, got {fit_mode!r}")
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+
+    user_inp = int(user_inp)
+    n_rows, n_piers = data.shape
+    if angles is not None:
+        if fit_mode != "lstsq":
+            raise ValueError("Non-uniform position angles need fit_mode='lstsq'")
+        basis = AngleBasis(user_inp, angles)
+    else:
+        basis = angle_basis(user_inp)
+
+    # Close the revolution by repeating the first reading
+    data_measured = np.vstack([data, data[:1]])
+
+    # Position / angle grid, padded to a common length exactly like the per-column frames
+    n_data_rows = len(data_measured)
+    max_length = max(len(basis.position), n_data_rows)
+    position = _pad_rows(basis.position, max_length)
+    measurement = _pad_rows(basis.measurement, max_length)
+    data_measured = _pad_rows(data_measured, max_length)
+
+    # Rows with an angle, except the final row of the frame, make up the revolution sums
+    n_sum = min(len(basis.measurement), max_length - 1)
+
+    if backend == "numba" and not NUMBA_AVAILABLE:
+        print("[Warning] numba is not installed, using the NumPy runout engine")
+    if backend != "numpy" and fit_mode == "sum" and NUMBA_AVAILABLE:
+        curves = fused_curves(data_measured, n_data_rows, basis.cos, basis.sin, basis.measurement, user_inp, n_sum)
+    else:
+        curves = _numpy_curves(data_measured, n_data_rows, basis, measurement, user_inp, n_sum, fit_mode)
+
+    valid = curves['valid']
+    run_out = curves['Run Out']
+    AA = _pad_rows(basis.radians, max_length)[:, None]
+
+    amplitude, phase = harmonic_spectrum(run_out[:user_inp], harmonics)
+    no_spectrum = ~valid
+    if fit_mode == "lstsq":
+        # The FFT counts missing readings as 0 and would disagree with the fitted X / Y
+        no_spectrum = no_spectrum | np.isnan(data_measured[:user_inp]).any(axis=0)
+    amplitude[:, no_spectrum] = np.nan
+    phase[:, no_spectrum] = np.nan
+    if not basis.uniform:
+        # The FFT assumes evenly spaced positions
+        amplitude[:] = np.nan
+        phase[:] = np.nan
+
+    return {
+        'Position': position,
+        'Measurement': measurement,
+        'Data Measured': data_measured,
+        'Run Out': run_out,
+        'AA': np.broadcast_to(AA, run_out.shape),
+        **curves,
+        'Harmonic Amplitude': amplitude,
+        'Harmonic Phase': phase,
+    }
+
+
+def _numpy_curves(data_measured, n_data_rows, basis, measurement, user_inp, n_sum, fit_mode):
+    """Run out, AB..AI and the per-pier results with whole-matrix NumPy operations"""
+    n_piers = data_measured.shape[1]
+    readings = data_measured[:n_data_rows]
+
+    # Piers without a single numeric reading are reported as invalid
+    valid = ~np.isnan(readings).all(axis=0)
+
+    max_measured = np.full(n_piers, np.nan)
+    max_measured[valid] = np.nanmax(readings[:, valid], axis=0)
+    shell_run_out = np.where(np.isnan(readings), 0.0, max_measured - readings)
+
+    run_out = _pad_rows(shell_run_out, len(data_measured))
+    trig = _pad_rows(np.column_stack([basis.cos, basis.sin]), len(data_measured))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        AB = trig[:, :1] * run_out
+        AC = trig[:, 1:] * run_out
+
+        if fit_mode == "lstsq":
+            # Only readings that exist take part, a lost reading no longer pulls the fit towards 0
+            mask = ~np.isnan(data_measured[:user_inp])
+            _, XX, YY = fit_first_harmonic(trig[:user_inp], run_out[:user_inp], mask)
+        else:
+            # SUM_AB / SUM_AC for every pier as one product against the basis
+            SUM_AB, SUM_AC = trig[:n_sum].T @ np.nan_to_num(run_out[:n_sum])
+
+            XX = 2 / user_inp * SUM_AB
+            YY = 2 / user_inp * SUM_AC
+        ZZ = np.sqrt(XX ** 2 + YY ** 2)
+
+        angle = np.degrees(np.arctan2(YY, XX)) % 360
+
+        AD = np.deg2rad(angle[None, :] - measurement[:, None])
+        # cos(phase - angle) and its ZZ multiple expanded over the cos/sin basis
+        AE = trig @ np.vstack([np.where(ZZ != 0, XX / ZZ, 1.0), np.where(ZZ != 0, YY / ZZ, 0.0)])
+        AF = trig @ np.vstack([XX, YY])
+        AG = run_out - AF
+        if fit_mode == "lstsq":
+            AVG_AG = _nanmean_rows(np.where(np.isnan(data_measured[:-1]), np.nan, AG[:-1]))
+        else:
+            AVG_AG = _nanmean_rows(AG[:-1])
+        AH = AG - AVG_AG[None, :]
+        AI = AF + AVG_AG[None, :]
+
+    return {
+        'Run Out': run_out,
+        'AB': AB,
+        'AC': AC,
+        'AD': AD,
+        'AE': AE,
+        'AF': AF,
+        'AG': AG,
+        'AH': AH,
+        'AI': AI,
+        'X': XX,
+        'Y': YY,
+        'Eccentricity (mm)': ZZ,
+        'Phase Angle': angle,
+        'Runout': shell_run_out.max(axis=0),
+        'Local Shell Deformation': AVG_AG,
+        'valid': valid,
+    }
+
+
+def fit_first_harmonic(trig, run_out, mask):
+    """
+    Least-squares fit of run_out = c + x * cos + y * sin for every pier,
+    using only the samples where mask is True.
+    trig: (rows x 2) cos/sin of each row's angle
+    All piers' 3x3 normal equations are built with two matrix products and
+    solved in one batched call. Returns (c, x, y) arrays, NaN for piers
+    with too few or degenerate samples.
+    """
+    rows, n_piers = run_out.shape
+    design = np.column_stack([np.ones(rows), trig])
+    weights = mask.astype(float)
+    values = np.where(mask, run_out, 0.0)
+
+    outer = (design[:, :, None] * design[:, None, :]).reshape(rows, 9)
+    normal = (outer.T @ weights).T.reshape(n_piers, 3, 3)
+    rhs = (design.T @ (weights * values)).T
+
+    count = weights.sum(axis=0)
+    solvable = (count >= 3) & (np.abs(np.linalg.det(normal)) > 1e-9 * np.maximum(count, 1) ** 3)
+    normal[~solvable] = np.eye(3)
+
+    coefficients = np.linalg.solve(normal, rhs[:, :, None])[:, :, 0]
+    coefficients[~solvable] = np.nan
+    return coefficients[:, 0], coefficients[:, 1], coefficients[:, 2]
+
+
+def harmonic_spectrum(run_out, harmonics=DEFAULT_HARMONICS):
+    """
+    Amplitude (mm) and phase (degrees) of harmonics 1..harmonics of every pier,
+    from one real FFT down the (positions x piers) run-out matrix of a revolution.
+    Missing readings count as run out 0, like the XX/YY sums of fit_mode="sum"
+    (compute_runout reports no harmonics for such piers under "lstsq"). Harmonic k is
+    amplitude * cos(k * angle - phase), so harmonic 1 is the eccentricity
+    and its phase follows the Phase Angle convention. Harmonics at or above
+    half the number of positions cannot be resolved and are NaN.
+    """
+    revolution = np.nan_to_num(np.asarray(run_out, dtype=float))
+    n_positions, n_piers = revolution.shape
+    amplitude = np.full((harmonics, n_piers), np.nan)
+    phase = np.full((harmonics, n_piers), np.nan)
+
+    resolved = min(harmonics, (n_positions - 1) // 2)
+    if resolved < 1:
+        return amplitude, phase
+
+    spectrum = np.fft.rfft(revolution, axis=0)[1:resolved + 1]
+    cos_part = 2 / n_positions * spectrum.real
+    sin_part = -2 / n_positions * spectrum.imag
+    amplitude[:resolved] = np.hypot(cos_part, sin_part)
+    phase[:resolved] = np.degrees(np.arctan2(sin_part, cos_part)) % 360
+    return amplitude, phase
+
+
+def _pad_rows(values, length):
+    # Pad along the position axis with NaN up to the requested length
+    missing = length - len(values)
+    if missing <= 0:
+        return values
+    pad_shape = (missing,) + values.shape[1:]
+    return np.concatenate([values, np.full(pad_shape, np.nan)])
+
+
+def _nanmean_rows(values):
+    # Column mean that skips NaN and yields NaN for an all-NaN column (like pandas)
+    count = (~np.isnan(values)).sum(axis=0)
+    total = np.nansum(values, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, total / np.maximum(count, 1), np.nan)
@@ -0,0 +1,160 @@
+import math
+import os
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+NUMBA_AVAILABLE = numba is not None
+
+
+def _fused_kernel(data, n_data_rows, cos, sin, measurement, n_angles, user_inp, n_sum,
+                  run_out, AB, AC, AD, AE, AF, AG, AH, AI, scalars):
+    """
+    One pass per pier over its readings, writing straight into the output curves.
+    data and the curves are (piers x rows); scalars is (piers x 7):
+    X, Y, Eccentricity, Phase Angle, Runout, Local Shell Deformation, valid.
+    Mirrors the NumPy path of compute_runout for fit_mode="sum".
+    """
+    n_piers, n_rows = data.shape
+    nan = np.nan
+    for j in prange(n_piers):
+        # Revolution maximum over the real readings
+        peak = -np.inf
+        valid = False
+        for r in range(n_data_rows):
+            value = data[j, r]
+            if not math.isnan(value):
+                valid = True
+                if value > peak:
+                    peak = value
+        if not valid:
+            peak = nan
+
+        # Run out and the cos/sin sums in the same pass
+        sum_cos = 0.0
+        sum_sin = 0.0
+        runout = -np.inf
+        for r in range(n_rows):
+            if r >= n_data_rows:
+                value = nan
+            elif math.isnan(data[j, r]):
+                value = 0.0
+            else:
+                value = peak - data[j, r]
+            run_out[j, r] = value
+            if r < n_data_rows and value > runout:
+                runout = value
+            if r < n_sum and not math.isnan(value):
+                sum_cos += cos[r] * value
+                sum_sin += sin[r] * value
+            if r < n_angles:
+                AB[j, r] = cos[r] * value
+                AC[j, r] = sin[r] * value
+            else:
+                AB[j, r] = nan
+                AC[j, r] = nan
+
+        xx = 2.0 / user_inp * sum_cos
+        yy = 2.0 / user_inp * sum_sin
+        zz = math.sqrt(xx * xx + yy * yy)
+        angle = math.degrees(math.atan2(yy, xx)) % 360.0
+        if zz != 0:
+            phase_cos = xx / zz
+            phase_sin = yy / zz
+        else:
+            phase_cos = 1.0
+            phase_sin = 0.0
+
+        # Fitted first harmonic and residual, with the residual mean over all but the closing row
+        total = 0.0
+        count = 0
+        for r in range(n_rows):
+            if r < n_angles:
+                AD[j, r] = math.radians(angle - measurement[r])
+                AE[j, r] = cos[r] * phase_cos + sin[r] * phase_sin
+                AF[j, r] = cos[r] * xx + sin[r] * yy
+            else:
+                AD[j, r] = nan
+                AE[j, r] = nan
+                AF[j, r] = nan
+            AG[j, r] = run_out[j, r] - AF[j, r]
+            if r < n_rows - 1 and not math.isnan(AG[j, r]):
+                total += AG[j, r]
+                count += 1
+        average = total / count if count > 0 else nan
+
+        for r in range(n_rows):
+            AH[j, r] = AG[j, r] - average
+            AI[j, r] = AF[j, r] + average
+
+        scalars[j, 0] = xx
+        scalars[j, 1] = yy
+        scalars[j, 2] = zz
+        scalars[j, 3] = angle
+        scalars[j, 4] = runout
+        scalars[j, 5] = average
+        scalars[j, 6] = 1.0 if valid else 0.0
+
+
+if numba is not None:
+    prange = numba.prange
+    _fused_kernel = numba.njit(parallel=True, cache=True, fastmath=False)(_fused_kernel)
+else:
+    prange = range
+
+
+def limit_kernel_threads(threads):
+    """
+    Cap the kernel's parallel threads, for worker processes that already share the cores.
+    Called before the first kernel run it also keeps numba from starting the other threads.
+    """
+    threads = max(int(threads), 1)
+    if numba is None:
+        os.environ['NUMBA_NUM_THREADS'] = str(threads)
+        return
+    try:
+        # numba sizes its pool from NUMBA_NUM_THREADS at import and never goes above that
+        threads = min(threads, numba.np.ufunc.parallel.NUM_THREADS)
+        os.environ['NUMBA_NUM_THREADS'] = str(threads)
+        numba.config.reload_config()
+        numba.set_num_threads(threads)
+    except Exception as e:
+        print(f"[Warning] Could not limit numba threads: {e}")
+
+
+CURVES = ['Run Out', 'AB', 'AC', 'AD', 'AE', 'AF', 'AG', 'AH', 'AI']
+
+
+def fused_curves(data_measured, n_data_rows, cos, sin, measurement, user_inp, n_sum):
+    """
+    Run out, AB..AI and the per-pier results from the compiled kernel.
+    data_measured: padded (rows x piers) readings with the closing row, n_data_rows of them real
+    cos / sin / measurement: the angle basis (closing row included), unpadded
+    Returns the same keys as the NumPy path; curves are (rows x piers) views.
+    """
+    data = np.ascontiguousarray(np.asarray(data_measured, dtype=float).T)
+    n_piers, n_rows = data.shape
+    curves = {name: np.empty((n_piers, n_rows)) for name in CURVES}
+    scalars = np.empty((n_piers, 7))
+
+    _fused_kernel(data, n_data_rows, np.ascontiguousarray(cos), np.ascontiguousarray(sin),
+                  np.ascontiguousarray(measurement), len(measurement), user_inp, n_sum,
+                  curves['Run Out'], curves['AB'], curves['AC'], curves['AD'], curves['AE'],
+                  curves['AF'], curves['AG'], curves['AH'], curves['AI'], scalars)
+
+    result = {name: values.T for name, values in curves.items()}
+    result.update({
+        'X': scalars[:, 0],
+        'Y': scalars[:, 1],
+        'Eccentricity (mm)': scalars[:, 2],
+        'Phase Angle': scalars[:, 3],
+        'Runout': scalars[:, 4],
+        'Local Shell Deformation': scalars[:, 5],
+        'valid': scalars[:, 6].astype(bool),
+    })
+    return result
@@ -0,0 +1,134 @@
+"""
+Synthetic kiln survey generator.
+
+Builds survey workbooks in the layout process_file reads: a CHAIRPAD NO
+column with one numeric row per position, one column per pier, and the
+distance / temperature rows at iloc 68-72. Each pier's readings are a known
+eccentric circle plus optional ovality and noise, so the expected
+Eccentricity (mm) and Phase Angle of every pier are known.
+
+Usage:
+    python synthetic_survey.py survey.xlsx --positions 64 --piers 4
+    python synthetic_survey.py big.xlsx --positions 360 --piers 500 --noise 0.01 --seed 3
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+# read_survey takes the pier metadata from these fixed rows (iloc)
+METADATA_ROW = 68
+METADATA_LABELS = ['Distance', 'Cumulative Distance', 'Min Temp', 'Max Temp', 'Avg Temp']
+
+
+def _per_pier(value, piers, name):
+    values = np.broadcast_to(np.asarray(value, dtype=float), (piers,)).copy()
+    if values.shape != (piers,):
+        raise ValueError(f"{name} must be a single value or one value per pier")
+    return values
+
+
+def generate_survey(positions=64, piers=4, eccentricity=0.3, phase=None, noise=0.02, ovality=0.0,
+                    base=11.0, pier_spacing=25.0, decimals=2, seed=0):
+    """
+    Build one synthetic survey.
+    eccentricity: mm, one value or one per pier
+    phase: degrees where the run out peaks, one value or one per pier
+           (default: spread evenly over the piers)
+    noise: standard deviation of the reading noise in mm
+    ovality: amplitude of a second harmonic (shell deformation), does not move the eccentricity
+    decimals: readings are rounded like dial gauge values, None keeps full precision
+    Returns (survey DataFrame, truth DataFrame with Position, Eccentricity (mm), Phase Angle).
+    """
+    if positions < 3:
+        raise ValueError("A survey needs at least 3 positions")
+    if piers < 1:
+        raise ValueError("A survey needs at least 1 pier")
+
+    rng = np.random.default_rng(seed)
+    eccentricity = _per_pier(eccentricity, piers, "eccentricity")
+    if phase is None:
+        phase = np.arange(piers) * 360.0 / piers
+    phase = _per_pier(phase, piers, "phase") % 360
+
+    # Run Out is max - reading, so a reading dip at the phase angle is a run out peak there
+    theta = np.deg2rad(np.arange(positions) * 360.0 / positions)[:, None]
+    readings = (base
+                - eccentricity[None, :] * np.cos(theta - np.deg2rad(phase)[None, :])
+                + ovality * np.cos(2 * theta)
+                + noise * rng.standard_normal((positions, piers)))
+    if decimals is not None:
+        readings = np.round(readings, decimals)
+
+    distance = np.full(piers, pier_spacing)
+    min_temp = np.round(200 + 40 * rng.random(piers), 1)
+    max_temp = np.round(min_temp + 20 + 30 * rng.random(piers), 1)
+    metadata = np.vstack([
+        distance,
+        np.cumsum(distance),
+        min_temp,
+        max_temp,
+        np.round((min_temp + max_temp) / 2, 1),
+    ])
+
+    # Positions fill the rows before the metadata block and continue after it,
+    # so surveys with more than 68 positions still keep metadata at iloc 68-72
+    chairpad = list(range(1, positions + 1))
+    blanks = max(METADATA_ROW - positions, 0)
+    head = min(positions, METADATA_ROW)
+
+    labels = chairpad[:head] + [np.nan] * blanks + METADATA_LABELS + chairpad[head:]
+    body = np.vstack([
+        readings[:head],
+        np.full((blanks, piers), np.nan),
+        metadata,
+        readings[head:],
+    ])
+
+    survey = pd.DataFrame(body, columns=[f"Pier {p+1}" for p in range(piers)])
+    survey.insert(0, 'CHAIRPAD NO', pd.Series(labels, dtype=object))
+
+    truth = pd.DataFrame({
+        'Position': np.arange(1, piers + 1),
+        'Eccentricity (mm)': eccentricity,
+        'Phase Angle': phase,
+    })
+    return survey, truth
+
+
+def write_survey(path, **kwargs):
+    """Write a synthetic survey workbook plus <name>_truth.csv, returns the truth table"""
+    survey, truth = generate_survey(**kwargs)
+    survey.to_excel(path, index=False)
+    truth.to_csv(truth_path(path), index=False)
+    return truth
+
+
+def truth_path(survey_path):
+    return f"{os.path.splitext(survey_path)[0]}_truth.csv"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic Roller shaft deflection survey workbook.")
+    parser.add_argument("output", help="Survey workbook to write (.xlsx)")
+    parser.add_argument("--positions", type=int, default=64, help="Readings per revolution")
+    parser.add_argument("--piers", type=int, default=4, help="Number of pier columns")
+    parser.add_argument("--eccentricity", type=float, default=0.3, help="Eccentricity of every pier in mm")
+    parser.add_argument("--phase", type=float, default=None, help="Phase angle of every pier in degrees (default: spread over the piers)")
+    parser.add_argument("--noise", type=float, default=0.02, help="Reading noise standard deviation in mm")
+    parser.add_argument("--ovality", type=float, default=0.0, help="Second harmonic amplitude in mm")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args(argv)
+
+    truth = write_survey(args.output, positions=args.positions, piers=args.piers, eccentricity=args.eccentricity,
+                         phase=args.phase, noise=args.noise, ovality=args.ovality, seed=args.seed)
+    print(f"[Success] Survey written: {args.output} ({args.positions} positions x {len(truth)} piers)")
+    print(f"[Info] Expected results: {truth_path(args.output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Per-pier result cache round trips, including piers whose charts could not be drawn.
+
+Run with:  python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("tkcalendar")
+
+import module5
+from synthetic_survey import generate_survey
+
+
+def write_two_position_survey(path):
+    """A survey with 2 positions per revolution, too few for a radar chart"""
+    survey, _ = generate_survey(positions=3, piers=2)
+    # Position 3 is dropped the way read_survey drops non-numeric CHAIRPAD NO rows
+    survey.loc[2, 'CHAIRPAD NO'] = np.nan
+    survey.to_excel(path, index=False)
+    readings = survey.iloc[:2, 1:].to_numpy(dtype=float)
+    return readings
+
+
+def test_pier_without_radar_is_cached(tmp_path):
+    survey_path = str(tmp_path / "survey.xlsx")
+    readings = write_two_position_survey(survey_path)
+    cache_dir = str(tmp_path / "pier_cache")
+
+    for run in range(2):
+        module5.process_file(survey_path, "Co", "Kiln", "-", "01/01/2026", 2, "2", 21,
+                             output_file=str(tmp_path / f"run{run}.xlsx"), pdf_path=str(tmp_path / f"run{run}.pdf"),
+                             interactive=False, pier_cache_dir=cache_dir)
+        assert os.path.exists(tmp_path / f"run{run}.pdf")
+
+    cache = module5.PierResultCache(cache_dir, 2, 21)
+    for j in range(readings.shape[1]):
+        entry = cache.get(readings[:, j])
+        assert entry is not None
+        assert 'radar' not in entry['charts']
+        assert entry['charts']['line'].startswith(b'\x89PNG')
+
+
+def test_put_skips_charts_that_were_not_drawn(tmp_path):
+    cache = module5.PierResultCache(str(tmp_path), 64, 21)
+    column = np.linspace(10.0, 11.0, 65)
+    pier = {
+        'sheet_data': module5.pd.DataFrame({'Position': np.arange(1, 66), 'Run Out': column}),
+        'summary': {'X': 0.1, 'Y': -0.2},
+        'harmonics': {},
+        'charts': {'line': b'\x89PNG line', 'radar': None},
+    }
+    cache.put(column, pier)
+
+    entry = cache.get(column)
+    assert entry['charts'] == {'line': b'\x89PNG line'}
+    assert entry['summary'] == pier['summary']
+    np.testing.assert_array_equal(entry['sheet_data']['Run Out'].to_numpy(), column)
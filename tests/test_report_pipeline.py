@@ -0,0 +1,41 @@
+"""
+Cancelling process_file after the pier loop must not leave a workbook or report behind.
+
+Run with:  python -m pytest tests
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("tkcalendar")
+
+import module5
+from synthetic_survey import generate_survey
+
+
+@pytest.mark.parametrize("excel_mode", ["standard", "streaming"])
+def test_cancel_after_last_pier_leaves_no_files(tmp_path, excel_mode):
+    survey_path = str(tmp_path / "survey.xlsx")
+    survey, _ = generate_survey(positions=8, piers=4)
+    survey.to_excel(survey_path, index=False)
+    output_file = tmp_path / "out.xlsx"
+    pdf_path = tmp_path / "out.pdf"
+
+    cancel_event = threading.Event()
+
+    def progress(message, done, total):
+        # Every pier has been handed to the pipeline once the last page is built
+        if message == "Building report page 4 of 4":
+            cancel_event.set()
+
+    with pytest.raises(module5.ProcessingCancelled):
+        module5.process_file(survey_path, "Co", "Kiln", "-", "01/01/2026", 8, "4", 8,
+                             output_file=str(output_file), pdf_path=str(pdf_path), interactive=False,
+                             excel_mode=excel_mode, progress=progress, cancel_event=cancel_event)
+
+    assert not output_file.exists()
+    assert not pdf_path.exists()
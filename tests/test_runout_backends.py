@@ -0,0 +1,75 @@
+"""
+The numba kernel must match the NumPy path of compute_runout.
+
+Run with:  python -m pytest tests
+"""
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from runout_engine import compute_runout
+from runout_kernels import NUMBA_AVAILABLE
+from synthetic_survey import generate_survey
+
+
+def survey_with_gaps(positions, piers, seed=0):
+    """Synthetic readings with scattered missing values and one pier without any readings"""
+    survey, _ = generate_survey(positions=positions, piers=piers, ovality=0.05, seed=seed)
+    # Reading rows only, as read_survey picks them (the metadata rows sit in between past 68 positions)
+    rows = survey['CHAIRPAD NO'].apply(lambda x: str(x).isnumeric())
+    readings = survey.loc[rows].iloc[:, 1:].to_numpy(dtype=float, copy=True)
+    rng = np.random.default_rng(seed)
+    readings[rng.random(readings.shape) < 0.1] = np.nan
+    readings[0, 1] = np.nan
+    readings[-1, 2] = np.nan
+    readings[:, 3] = np.nan
+    return readings
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba is not installed")
+@pytest.mark.parametrize("positions, user_inp", [(64, 64), (64, 60), (8, 8), (360, 360)])
+def test_numba_matches_numpy(positions, user_inp):
+    readings = survey_with_gaps(positions, piers=12)
+    expected = compute_runout(readings, user_inp, backend="numpy")
+    actual = compute_runout(readings, user_inp, backend="numba")
+
+    assert list(actual) == list(expected)
+    assert not expected['valid'][3]
+    for name in expected:
+        np.testing.assert_allclose(np.asarray(actual[name], dtype=float), np.asarray(expected[name], dtype=float),
+                                   rtol=1e-9, atol=1e-12, equal_nan=True, err_msg=name)
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba is not installed")
+def test_limit_kernel_threads_above_import_limit():
+    """Asking for more threads than numba started with caps at its pool instead of raising"""
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = ("import numba\n"
+              "from runout_kernels import limit_kernel_threads\n"
+              "limit_kernel_threads(4)\n"
+              "print(numba.get_num_threads())\n")
+    env = dict(os.environ, NUMBA_NUM_THREADS="1")
+    done = subprocess.run([sys.executable, "-c", script], cwd=repo, env=env,
+                          capture_output=True, text=True, timeout=120)
+    assert done.returncode == 0, done.stderr
+    assert done.stdout.split() == ["1"]
+
+
+def test_lstsq_harmonics_follow_the_fit():
+    """Under lstsq, H1 matches the fitted eccentricity, and piers with missing readings get no harmonics"""
+    survey, _ = generate_survey(positions=64, piers=6, ovality=0.05)
+    readings = survey.iloc[:64, 1:].to_numpy(dtype=float, copy=True)
+    readings[5, 1] = np.nan
+    readings[40:, 3] = np.nan
+    results = compute_runout(readings, 64, fit_mode="lstsq")
+
+    complete = np.array([True, False, True, False, True, True])
+    np.testing.assert_allclose(results['Harmonic Amplitude'][0, complete], results['Eccentricity (mm)'][complete])
+    np.testing.assert_allclose(results['Harmonic Phase'][0, complete], results['Phase Angle'][complete])
+    assert np.isnan(results['Harmonic Amplitude'][:, ~complete]).all()
+    assert np.isnan(results['Harmonic Phase'][:, ~complete]).all()